@@ -0,0 +1,94 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+# Function name -> CallbackCache, for every memoized callback
+CACHES = {}
+
+
+def _freeze(value):
+    """Hashable stand-in for callback arguments (Dash passes lists and dicts)"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class CallbackCache:
+    """
+    Bounded LRU cache of callback results. Entries older than `ttl` seconds
+    (when set) count as misses and are recomputed.
+    """
+
+    def __init__(self, maxsize=128, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, key):
+        """Return (found, value), counting the hit or miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl is None or time.monotonic() - entry[0] < self.ttl):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'size': len(self._entries), 'maxsize': self.maxsize, 'ttl': self.ttl}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def memoize(store, datasets=None, maxsize=128, ttl=None):
+    """
+    Cache a callback's output per (arguments, versions of `datasets`), so a
+    repeat view is served without recomputing until the data it reads changes.
+    `datasets` defaults to every dataset in the store. Place it below
+    @app.callback; never use it on callbacks with side effects.
+    """
+
+    def decorator(func):
+        cache = CallbackCache(maxsize, ttl)
+        CACHES[func.__name__] = cache
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            names = datasets or tuple(store.datasets)
+            key = (_freeze(args), tuple(store.dataset_version(name) for name in names))
+            found, value = cache.lookup(key)
+            if found:
+                return value
+            value = func(*args)
+            cache.put(key, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def cache_stats():
+    """Hit/miss/eviction counters of every memoized callback"""
+    return {name: cache.stats() for name, cache in CACHES.items()}
@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+
+from data_store import DATE_FORMAT, month_codes
+
+# LTV windows, in days from a customer's first attributed order
+LTV_WINDOWS = (30, 60, 90, 180)
+DEFAULT_LTV_WINDOW = 90
+
+# Tracking columns the cohort engine reads
+COHORT_COLUMNS = ['influencer_id', 'user_id', 'date', 'month_code', 'revenue']
+
+
+def _window_revenue(user_codes, days, revenue, first_days, windows):
+    """
+    Revenue of each user's orders dated within each window of their first
+    order (days first_day .. first_day + window - 1). Codes below
+    len(first_days) are known users; the first order of every other user is
+    taken from the same sort. The rows are sorted once on a (user, day) key;
+    every window edge is then a searchsorted into the sorted keys and the sum
+    a difference of cumulative revenue.
+    Returns (the first row of each new user, per-user window sums).
+    """
+    n_known = len(first_days)
+    n_users = max(n_known, user_codes.max() + 1)
+    origin = min(days.min(), first_days.min()) if n_known else days.min()
+    latest = max(days.max(), first_days.max()) if n_known else days.max()
+    span = latest + max(windows) - origin + 1
+    keys = user_codes.astype(np.int64) * span + (days - origin)
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    cumulative = np.concatenate(([0.0], np.cumsum(revenue[order])))
+
+    # Equal keys keep their row order, so ties go to the earliest row
+    user_starts = np.arange(n_known, n_users, dtype=np.int64) * span
+    first_rows = order[np.searchsorted(keys, user_starts, side='left')]
+    first_days = np.concatenate((first_days, days[first_rows]))
+    base = np.arange(n_users, dtype=np.int64) * span + (first_days - origin)
+    starts = np.searchsorted(keys, base, side='left')
+    sums = np.zeros((n_users, len(windows)))
+    for i, window in enumerate(windows):
+        ends = np.searchsorted(keys, base + window, side='left')
+        sums[:, i] = cumulative[ends] - cumulative[starts]
+    return first_rows, sums
+
+
+class CohortLTV:
+    """
+    Per-customer state behind the cohort LTV tables: each user's first
+    attributed order (day, month code and influencer) and their revenue
+    inside every LTV window. Like RunningTotals, instances are never modified in place; add()
+    folds appended tracking rows into a new instance.
+    """
+
+    def __init__(self, windows=LTV_WINDOWS, users=None, influencers=None,
+                 first_days=None, revenue=None, last_day=None, first_months=None):
+        self.windows = tuple(windows)
+        self.users = pd.Index([], dtype=object) if users is None else users
+        self.influencers = np.array([], dtype=object) if influencers is None else influencers
+        self.first_days = np.array([], dtype=np.int64) if first_days is None else first_days
+        self.revenue = np.zeros((0, len(self.windows))) if revenue is None else revenue
+        # Cohort key of each user: the month_code of their first order
+        self.first_months = np.array([], dtype=np.int32) if first_months is None else first_months
+        # Latest order day seen; windows ending after it are not complete yet
+        self.last_day = last_day
+
+    def add(self, rows):
+        """
+        New instance with tracking rows folded in. Returns None when a row
+        predates a known customer's first order, which would change their
+        attribution; the caller rebuilds from the full table instead.
+        """
+        if not len(rows):
+            return self
+        dates = rows['date']
+        if not pd.api.types.is_datetime64_dtype(dates.dtype):
+            dates = pd.to_datetime(dates, format=DATE_FORMAT, errors='coerce')
+        days = dates.to_numpy(dtype='datetime64[D]')
+        codes, uniques = pd.factorize(rows['user_id'])
+        positions = np.flatnonzero((codes >= 0) & ~np.isnat(days))
+        if not len(positions):
+            return self
+        days = days[positions].astype(np.int64)
+        # Loaded frames carry precomputed month codes; appended upload rows do not
+        months = rows['month_code'] if 'month_code' in rows.columns else month_codes(dates)
+        months = months.to_numpy(dtype=np.int32)[positions]
+        revenue = pd.to_numeric(rows['revenue'], errors='coerce').to_numpy(dtype=float)[positions]
+        revenue = np.nan_to_num(revenue)
+
+        # Codes of new users follow the known ones
+        uniques = pd.Index(np.asarray(uniques, dtype=object))
+        known = self.users.get_indexer(uniques)
+        new = np.flatnonzero(known < 0)
+        n_known = len(self.users)
+        known[new] = n_known + np.arange(len(new))
+        user_codes = known[codes[positions]]
+
+        old_rows = user_codes < n_known
+        if (days[old_rows] < self.first_days[user_codes[old_rows]]).any():
+            return None
+        first, window_revenue = _window_revenue(user_codes, days, revenue, self.first_days, self.windows)
+        first_days = np.concatenate((self.first_days, days[first]))
+        influencers = np.concatenate((
+            self.influencers, rows['influencer_id'].iloc[positions[first]].to_numpy(dtype=object)))
+        first_months = np.concatenate((self.first_months, months[first]))
+        window_revenue[:n_known] += self.revenue
+        last_day = days.max() if self.last_day is None else max(self.last_day, days.max())
+        return CohortLTV(self.windows, self.users.append(uniques[new]), influencers,
+                         first_days, window_revenue, last_day, first_months)
+
+    def _user_costs(self, payout_df):
+        """Acquisition cost of each customer: their influencer's total_cost over customers acquired"""
+        acquired = pd.Series(self.influencers).value_counts()
+        cost = payout_df.groupby(payout_df['influencer_id'].astype(object))['total_cost'].sum()
+        cac = cost.reindex(acquired.index) / acquired
+        return cac.reindex(self.influencers).to_numpy(dtype=float)
+
+    def _summarize(self, key, keys, payout_df):
+        """
+        Customers, CAC and per-window LTV and LTV:CAC grouped by keys.
+        A window's LTV only counts customers whose window has fully elapsed.
+        """
+        costs = self._user_costs(payout_df)
+        frame = {key: keys, 'customers': 1, 'costed_customers': ~np.isnan(costs),
+                 'cost': np.nan_to_num(costs)}
+        for i, window in enumerate(self.windows):
+            complete = self.first_days + (window - 1) <= (self.last_day or 0)
+            frame[f'customers_{window}'] = complete
+            frame[f'revenue_{window}'] = np.where(complete, self.revenue[:, i], 0.0)
+        table = pd.DataFrame(frame).groupby(key, sort=True).sum()
+        table['cac'] = table['cost'] / table['costed_customers'].replace(0, np.nan)
+        for window in self.windows:
+            table[f'ltv_{window}'] = table[f'revenue_{window}'] / table[f'customers_{window}'].replace(0, np.nan)
+            table[f'ltv_cac_{window}'] = table[f'ltv_{window}'] / table['cac'].replace(0, np.nan)
+        return table.drop(columns=['costed_customers', 'cost']).reset_index()
+
+    def by_influencer(self, payout_df):
+        """LTV and LTV:CAC of the customers each influencer acquired"""
+        return self._summarize('influencer_id', self.influencers, payout_df)
+
+    def by_cohort(self, payout_df):
+        """
+        LTV and LTV:CAC per acquisition month. A cohort's CAC blends the CAC
+        of the influencers that acquired its customers.
+        """
+        table = self._summarize('cohort_month', self.first_months, payout_df)
+        # Month codes count months since 1970-01, as datetime64[M] does
+        table['cohort_month'] = pd.PeriodIndex(table['cohort_month'].to_numpy().astype('datetime64[M]'), freq='M')
+        return table
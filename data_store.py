@@ -0,0 +1,725 @@
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    COLUMNAR_AVAILABLE = True
+except ImportError:
+    COLUMNAR_AVAILABLE = False
+
+try:
+    import fcntl
+except ImportError:  # Windows - segment compaction is then only safe within one process
+    fcntl = None
+
+# Format of every date column in the data files
+DATE_FORMAT = '%Y-%m-%d'
+
+# Dataset name -> CSV file under the data directory
+DATASETS = {
+    'influencers': 'influencers.csv',
+    'payouts': 'payouts.csv',
+    'instagram': 'instagram_insights_data.csv',
+    'youtube': 'youtube_analytics_data.csv',
+    'tracking': 'tracking_data.csv',
+    'posts': 'posts.csv',
+    'brand_performance': 'brand_performance.csv',
+    'audience_demographics': 'audience_demographics.csv',
+    'campaign_performance': 'campaign_performance_insights.csv',
+    'geographic_distribution': 'geographic_distribution.csv',
+    'tracking_codes': 'influencer_tracking_codes.csv',
+}
+
+# Typed schemas for the known columns of each dataset.
+# Columns not listed keep the dtype inferred by pandas; 'datetime64' columns
+# are parsed with DATE_FORMAT.
+SCHEMAS = {
+    'payouts': {
+        'influencer_id': 'object', 'basis': 'object', 'rate': 'object',
+        'orders': 'int64', 'total_revenue': 'float64', 'payout_amount': 'float64',
+        'gifted_products_cost': 'float64', 'total_cost': 'float64',
+    },
+    'influencers': {
+        'influencer_id': 'object', 'name': 'object', 'category': 'object',
+        'gender': 'object', 'follower_count': 'int64', 'platform': 'object',
+    },
+    'instagram': {
+        'post_id': 'object', 'influencer_id': 'object', 'date': 'datetime64',
+        'impressions': 'int64', 'reach': 'int64', 'likes': 'int64', 'comments': 'int64',
+        'shares': 'int64', 'saves': 'int64', 'profile_visits': 'int64',
+        'website_clicks': 'int64', 'story_impressions': 'int64', 'story_exits': 'int64',
+        'story_completion_rate': 'float64',
+    },
+    'youtube': {
+        'post_id': 'object', 'influencer_id': 'object', 'video_title': 'object',
+        'date': 'datetime64', 'impressions': 'int64', 'impressions_ctr_percentage': 'float64',
+        'views': 'int64', 'watch_time_hours': 'float64',
+        'average_view_duration_seconds': 'float64', 'audience_retention_percentage': 'float64',
+        'likes': 'int64', 'comments': 'int64', 'subscribers_gained': 'int64',
+        'estimated_revenue_inr': 'float64',
+    },
+    'tracking': {
+        'influencer_id': 'object', 'user_id': 'object', 'product': 'object',
+        'date': 'datetime64', 'orders': 'int64', 'revenue': 'float64',
+    },
+    'posts': {
+        'post_id': 'object', 'influencer_id': 'object', 'platform': 'object',
+        'date': 'datetime64', 'url': 'object', 'caption': 'object', 'brand_mentioned': 'object',
+        'reach': 'int64', 'likes': 'int64', 'comments': 'int64', 'shares': 'int64',
+        'video_views': 'int64', 'watch_time_minutes': 'float64',
+    },
+    'brand_performance': {
+        'brand': 'object', 'campaigns': 'int64', 'total_reach': 'int64',
+        'total_revenue': 'float64', 'total_cost': 'float64', 'roas': 'float64',
+    },
+    'audience_demographics': {
+        'influencer_id': 'object', 'platform': 'object', 'age_group': 'object',
+        'gender': 'object', 'views_percentage': 'float64', 'estimated_views': 'int64',
+    },
+    'geographic_distribution': {
+        'influencer_id': 'object', 'city': 'object',
+        'views_percentage': 'float64', 'estimated_views': 'int64',
+    },
+    'tracking_codes': {
+        'influencer_id': 'object', 'tracking_code': 'object',
+        'utm_source': 'object', 'campaign_tag': 'object',
+    },
+}
+
+# Key under which the source CSV signature is stored in the columnar file metadata
+SOURCE_SIGNATURE_KEY = b'healthkart.source_signature'
+
+# Bumped whenever the typed layout of the columnar copies changes, so copies
+# written by an older version are rebuilt
+COLUMNAR_FORMAT = 2
+
+# Integer period keys derived from a date column when a dataset is loaded:
+# column -> source date column. month_code counts months since 1970-01 (the
+# pandas monthly Period ordinal), -1 for missing dates.
+DERIVED_COLUMNS = {'month_code': 'date'}
+
+# Datasets stored as uncompressed Arrow IPC files and opened through a memory
+# map, so every gunicorn worker shares the same page-cache pages instead of
+# holding a private heap copy of the table.
+MAPPED_DATASETS = ('tracking',)
+
+# pandas dtypes for the string columns of a mapped table, which keep their
+# Arrow buffers instead of being converted to Python objects
+ARROW_STRING_DTYPES = {pa.string(): pd.StringDtype('pyarrow'),
+                       pa.large_string(): pd.StringDtype('pyarrow')} if COLUMNAR_AVAILABLE else {}
+
+# Repeated string columns that are dictionary-encoded as pandas categoricals
+CATEGORICAL_COLUMNS = ('influencer_id', 'platform', 'category', 'brand_mentioned',
+                       'product', 'city', 'age_group', 'gender')
+
+# Categorical columns whose dictionary is shared by every dataset, so merges
+# on them compare integer codes instead of strings
+SHARED_CATEGORICAL_COLUMNS = ('influencer_id',)
+
+# Integer columns are narrowed to int32 only while the column total, with room
+# for small multipliers, still fits - pandas keeps the narrow dtype for sums
+# that fit, and later arithmetic on them would otherwise wrap around.
+INT32_SAFE_TOTAL = np.iinfo(np.int32).max // 16
+
+# Appended rows are written as immutable segment files under this directory
+# (one sub-directory per dataset) until the compactor folds them into the base CSV
+SEGMENTS_DIR = 'segments'
+
+# Per-dataset write counters shared by every process using the data directory.
+# Each committed write bumps its dataset's counter, so a worker only has to stat
+# this one file to learn which datasets another worker changed.
+GENERATION_FILE = '.generation'
+
+# Datasets whose generation has not moved are still re-checked on disk at this
+# interval (seconds), to pick up files replaced outside the dashboard
+RECHECK_INTERVAL = 30
+
+
+def apply_schema(df, schema):
+    """Cast the schema columns present in df; integer columns holding NaN stay float"""
+    for col, dtype in schema.items():
+        if col not in df.columns:
+            continue
+        if dtype == 'object':
+            df[col] = df[col].astype(object)
+            continue
+        if dtype == 'datetime64':
+            if not pd.api.types.is_datetime64_dtype(df[col].dtype):
+                df[col] = pd.to_datetime(df[col], format=DATE_FORMAT, errors='coerce')
+            continue
+        values = pd.to_numeric(df[col], errors='coerce')
+        if dtype == 'int64' and values.isna().any():
+            dtype = 'float64'
+        df[col] = values.astype(dtype)
+    return df
+
+
+def month_codes(dates):
+    """Months since 1970-01 for a datetime64 Series, -1 where the date is missing"""
+    codes = (dates.dt.year - 1970) * 12 + dates.dt.month - 1
+    return codes.fillna(-1).astype('int32')
+
+
+def add_derived_columns(df, columns=None):
+    """Add the DERIVED_COLUMNS whose source column is present (only `columns`, if given)"""
+    for col, source in DERIVED_COLUMNS.items():
+        if source in df.columns and (columns is None or col in columns) \
+                and pd.api.types.is_datetime64_dtype(df[source].dtype):
+            df[col] = month_codes(df[source])
+    return df
+
+
+def optimize_dtypes(df):
+    """Dictionary-encode repeated string columns and downcast integer columns"""
+    for col in df.columns:
+        if col in CATEGORICAL_COLUMNS:
+            df[col] = df[col].astype('category')
+        elif pd.api.types.is_integer_dtype(df[col].dtype) and df[col].abs().sum() <= INT32_SAFE_TOTAL:
+            df[col] = df[col].astype('int32')
+    return df
+
+
+def unoptimized_memory(df):
+    """Estimate the bytes df would take with object strings and int64 counts"""
+    total = 0
+    for col in df.columns:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            total += values.astype(object).memory_usage(deep=True, index=False)
+        elif pd.api.types.is_integer_dtype(values.dtype):
+            total += len(values) * 8
+        else:
+            total += values.memory_usage(deep=True, index=False)
+    return total
+
+
+class CategoryDictionary:
+    """
+    Append-only category lists shared across datasets.
+    A value keeps its code for the life of the process; unseen values are added
+    at the end, so frames encoded earlier stay valid.
+    """
+
+    def __init__(self):
+        self._categories = {}
+        self._lock = threading.Lock()
+
+    def encode(self, col, values):
+        with self._lock:
+            categories = self._categories.get(col, pd.Index([], dtype=object))
+            seen = values.cat.categories if isinstance(values.dtype, pd.CategoricalDtype) else values.dropna().unique()
+            new = pd.Index(seen).difference(categories)
+            if len(new):
+                categories = categories.append(new.astype(object))
+                self._categories[col] = categories
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            return values.cat.set_categories(categories)
+        return pd.Categorical(values, categories=categories)
+
+
+# Payout columns that uploads add onto an influencer's existing totals
+PAYOUT_TOTAL_COLUMNS = ['orders', 'total_revenue', 'total_cost']
+
+
+def aggregate_payout_upload(df_new):
+    """
+    One row per influencer in upload order: the first uploaded row, with
+    orders/revenue/cost summed over all of that influencer's rows
+    """
+    ids = df_new['influencer_id'].astype(object)
+    totals = df_new[PAYOUT_TOTAL_COLUMNS].groupby(ids, sort=False, dropna=False).sum()
+    upload = df_new[~ids.duplicated()].reset_index(drop=True)
+    for col in PAYOUT_TOTAL_COLUMNS:
+        upload[col] = totals[col].to_numpy()
+    return upload
+
+
+def upsert_payouts(existing_df, df_new):
+    """Add uploaded orders/revenue/cost to existing influencer totals; unseen influencers are appended"""
+    upload = aggregate_payout_upload(df_new)
+    upload_ids = upload['influencer_id'].astype(object)
+    existing_ids = existing_df['influencer_id'].astype(object)
+    # Only the first row of an influencer receives the upload
+    target = ~existing_ids.duplicated()
+    totals = upload[PAYOUT_TOTAL_COLUMNS].set_axis(upload_ids)
+    existing_df = existing_df.copy()
+    for col in PAYOUT_TOTAL_COLUMNS:
+        added = totals[col].reindex(existing_ids, fill_value=0).to_numpy()
+        existing_df[col] = existing_df[col] + np.where(target, added, 0)
+    inserted = upload[~upload_ids.isin(existing_ids)]
+    return pd.concat([existing_df, inserted], ignore_index=True)
+
+
+def payout_upsert_diff(existing_df, df_new):
+    """Per-influencer change upsert_payouts(existing_df, df_new) makes: status plus the amounts added"""
+    upload = aggregate_payout_upload(df_new)
+    updated = upload['influencer_id'].astype(object).isin(existing_df['influencer_id'].astype(object))
+    diff = upload[['influencer_id'] + PAYOUT_TOTAL_COLUMNS].copy()
+    diff.insert(1, 'status', np.where(updated, 'updated', 'inserted'))
+    return diff
+
+
+# Dataset name -> merge(frame, segment) for datasets whose segments are not
+# plain row appends. Segments are applied in the order they were written.
+MERGE_POLICIES = {
+    'payouts': upsert_payouts,
+}
+
+
+def read_csv_typed(source, schema=None, columns=None, **kwargs):
+    """Parse a CSV, reading text columns as strings and casting the rest per schema"""
+    schema = schema or {}
+    text_cols = {col: str for col, dtype in schema.items() if dtype == 'object'}
+    df = pd.read_csv(source, dtype=text_cols, usecols=columns, **kwargs)
+    return apply_schema(df, schema)
+
+
+class DataStore:
+    """
+    Owns every dashboard dataset.
+    Datasets are loaded lazily on first access; each file is parsed once and
+    only re-read when its mtime or size changes.
+    `version` increases every time a dataset's file changes.
+
+    When pyarrow is installed, a typed Parquet copy of each CSV is kept next
+    to it and used for loading, so column projections only read what they need.
+    Datasets in `mapped` use a memory-mapped Arrow IPC file instead of Parquet.
+
+    Uploads go through append(), which writes the new rows as an immutable
+    segment file; readers see the base file combined with its segments, and
+    compact() (run periodically by start_compactor()) folds segments back into
+    the base file.
+
+    Writes bump a per-dataset counter in the shared generation file; sync()
+    (called once per request) reads it and marks the datasets another process
+    changed, and only those are stat'ed and reloaded.
+    """
+
+    def __init__(self, data_dir='data', datasets=None, columnar=True, mapped=MAPPED_DATASETS,
+                 recheck_interval=RECHECK_INTERVAL):
+        self.data_dir = data_dir
+        self.datasets = dict(datasets or DATASETS)
+        self.columnar = columnar and COLUMNAR_AVAILABLE
+        self.mapped = set(mapped)
+        self.categories = CategoryDictionary()
+        self.recheck_interval = recheck_interval
+        self.version = 0
+        self._generations = {}
+        self._generation_signature = None
+        self._checked = {}
+        self._dirty = set()
+        self._frames = {}
+        self._signatures = {}
+        self._versions = {}
+        self._lock = threading.RLock()
+        self._dataset_locks = {}
+
+    def path(self, name):
+        return os.path.join(self.data_dir, self.datasets[name])
+
+    def columnar_path(self, name):
+        extension = '.arrow' if name in self.mapped else '.parquet'
+        return os.path.splitext(self.path(name))[0] + extension
+
+    def segment_dir(self, name):
+        return os.path.join(self.data_dir, SEGMENTS_DIR, name)
+
+    def _segments(self, name):
+        """Pending segment files of a dataset, oldest first"""
+        try:
+            return sorted(f for f in os.listdir(self.segment_dir(name)) if f.endswith('.csv'))
+        except OSError:
+            return []
+
+    def _base_signature(self, name):
+        try:
+            stat = os.stat(self.path(name))
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _signature(self, name):
+        return (self._base_signature(name), tuple(self._segments(name)))
+
+    @contextmanager
+    def _segment_lock(self, name, exclusive=False):
+        """
+        Cross-process lock on a dataset's segments. Readers hold it shared while
+        reading base file and segments, so they never see a compaction half done.
+        """
+        directory = self.segment_dir(name)
+        if fcntl is None or not os.path.isdir(directory):
+            yield
+            return
+        with open(os.path.join(directory, '.lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _tmp_path(self, path):
+        return path + '.tmp%d.%d' % (os.getpid(), threading.get_ident())
+
+    def _columnar_signature(self, name):
+        try:
+            if name in self.mapped:
+                with pa.memory_map(self.columnar_path(name), 'r') as source:
+                    schema = pa.ipc.open_file(source).schema
+            else:
+                schema = pq.read_schema(self.columnar_path(name))
+        except Exception:
+            return None
+        return (schema.metadata or {}).get(SOURCE_SIGNATURE_KEY)
+
+    def _write_columnar(self, name, df, signature):
+        """Write the typed columnar copy of a dataset, tagged with its source CSV signature"""
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[SOURCE_SIGNATURE_KEY] = ('%d:%d:%d' % ((COLUMNAR_FORMAT,) + signature)).encode()
+        table = table.replace_schema_metadata(metadata)
+        tmp_path = self._tmp_path(self.columnar_path(name))
+        if name in self.mapped:
+            # Uncompressed so the file can be mapped and used in place
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        else:
+            pq.write_table(table, tmp_path)
+        os.replace(tmp_path, self.columnar_path(name))
+
+    def _read_columnar(self, name, columns=None):
+        if name not in self.mapped:
+            return pd.read_parquet(self.columnar_path(name), columns=columns)
+        # The table's buffers point straight into the mapping, and a projection
+        # only selects columns of it. Numeric columns without nulls are handed
+        # to pandas without copying, and string columns stay Arrow-backed
+        # instead of becoming per-process Python objects.
+        table = pa.ipc.open_file(pa.memory_map(self.columnar_path(name), 'r')).read_all()
+        if columns is not None:
+            table = table.select([col for col in columns if col in table.column_names])
+        df = table.to_pandas(split_blocks=True, types_mapper=ARROW_STRING_DTYPES.get)
+        return df if columns is None or list(df.columns) == list(columns) else df.reindex(columns=list(columns))
+
+    def _load_base(self, name, columns=None):
+        path = self.path(name)
+        signature = self._base_signature(name)
+        schema = SCHEMAS.get(name, {})
+        if signature is None:
+            # A missing file is an empty table with the dataset's columns, so
+            # projections and column lookups behave as they do on real data
+            df = apply_schema(pd.DataFrame(columns=list(schema)), schema)
+            return df if columns is None else df.reindex(columns=list(columns))
+        if not self.columnar:
+            return optimize_dtypes(read_csv_typed(path, schema, columns=columns))
+        if self._columnar_signature(name) != ('%d:%d:%d' % ((COLUMNAR_FORMAT,) + signature)).encode():
+            df = optimize_dtypes(read_csv_typed(path, schema))
+            self._write_columnar(name, df, signature)
+            if name not in self.mapped:
+                return df if columns is None else df[list(columns)]
+        return self._read_columnar(name, columns)
+
+    def _merge_segments(self, name, base, segments):
+        merge = MERGE_POLICIES.get(name)
+        if merge is None:
+            df = pd.concat([base] + segments, ignore_index=True)
+        else:
+            df = base
+            for segment in segments:
+                df = merge(df, segment)
+        return optimize_dtypes(apply_schema(df, SCHEMAS.get(name, {})))
+
+    def _read(self, name, columns=None):
+        """Read the base file and its segments; returns (base signature, segment names, frame)"""
+        with self._segment_lock(name):
+            base_signature = self._base_signature(name)
+            segments = self._segments(name)
+            # Segments may hold columns outside the projection, so merge in full
+            base = self._load_base(name, None if segments else columns)
+            frames = [read_csv_typed(os.path.join(self.segment_dir(name), segment), SCHEMAS.get(name, {}))
+                      for segment in segments]
+        if not segments:
+            return base_signature, segments, base
+        df = self._merge_segments(name, base, frames)
+        return base_signature, segments, df if columns is None else df.reindex(columns=list(columns))
+
+    def _load(self, name, columns=None):
+        try:
+            if columns is None:
+                return add_derived_columns(self._read(name)[2])
+            # Derived columns are computed from their source, not read from disk
+            read_columns = [col for col in columns if col not in DERIVED_COLUMNS]
+            read_columns += [DERIVED_COLUMNS[col] for col in columns
+                             if col in DERIVED_COLUMNS and DERIVED_COLUMNS[col] not in read_columns]
+            df = self._read(name, read_columns)[2]
+            # Derived columns are inserted and unrequested sources deleted in
+            # place, since selecting columns would copy the whole projection
+            for position, col in enumerate(columns):
+                source = DERIVED_COLUMNS.get(col)
+                if source in df.columns and pd.api.types.is_datetime64_dtype(df[source].dtype):
+                    df.insert(min(position, len(df.columns)), col, month_codes(df[source]))
+            for col in list(df.columns):
+                if col not in columns:
+                    del df[col]
+            return df
+        except Exception as e:
+            print(f"Error loading {name} from {self.path(name)}: {e}")
+            return pd.DataFrame()
+
+    def _share_categories(self, df):
+        for col in SHARED_CATEGORICAL_COLUMNS:
+            if col in df.columns:
+                df[col] = self.categories.encode(col, df[col])
+        return df
+
+    def get(self, name, columns=None):
+        """
+        Return the current frame for a dataset, reloading it if the file changed.
+        `columns` restricts the load to a projection of the dataset.
+        """
+        key = name if columns is None else (name, tuple(columns))
+        # Loads hold only their dataset's lock, so a slow load (or a background
+        # warm-up) never blocks requests for datasets that are already cached.
+        with self._dataset_lock(name):
+            signature = self._check(name)
+            with self._lock:
+                cached = self._frames.get(key)
+                if cached is not None and cached[0] == signature:
+                    return cached[1]
+                full = self._frames.get(name)
+            # Projections of a mapped dataset without segments are selected
+            # from the mapped table rather than copied out of the full frame
+            mapped = name in self.mapped and self.columnar and not signature[1]
+            if columns is not None and full is not None and full[0] == signature and not mapped:
+                frame = full[1].reindex(columns=list(columns))
+            else:
+                frame = self._share_categories(self._load(name, columns))
+            with self._lock:
+                self._frames[key] = (signature, frame)
+            return frame
+
+    def _check(self, name):
+        """
+        Stat a dataset's file and segments, bumping its version if they changed;
+        returns the signature. Skipped while the dataset is known to be current.
+        """
+        with self._lock:
+            if (name in self._versions and name not in self._dirty
+                    and time.monotonic() - self._checked[name] < self.recheck_interval):
+                return self._signatures[name]
+            self._dirty.discard(name)
+            self._checked[name] = time.monotonic()
+        signature = self._signature(name)
+        with self._lock:
+            if name not in self._versions or self._signatures.get(name) != signature:
+                self._signatures[name] = signature
+                self.version += 1
+                self._versions[name] = self.version
+        return signature
+
+    def generation_path(self):
+        return os.path.join(self.data_dir, GENERATION_FILE)
+
+    def _read_generations(self):
+        try:
+            with open(self.generation_path()) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _bump_generation(self, name):
+        """Record a committed write to a dataset, for this process and every other one"""
+        with self._lock:
+            self._dirty.add(name)
+        lock_path = self.generation_path() + '.lock'
+        with open(lock_path, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                generations = self._read_generations()
+                generations[name] = generations.get(name, 0) + 1
+                tmp_path = self._tmp_path(self.generation_path())
+                with open(tmp_path, 'w') as f:
+                    json.dump(generations, f)
+                os.replace(tmp_path, self.generation_path())
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def sync(self):
+        """
+        Pick up writes made by other processes: one stat of the generation file,
+        and the datasets whose counter moved are re-checked on their next access.
+        Returns the names of those datasets.
+        """
+        try:
+            stat = os.stat(self.generation_path())
+            signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        except OSError:
+            signature = None
+        with self._lock:
+            if signature == self._generation_signature:
+                return []
+        generations = self._read_generations()
+        with self._lock:
+            self._generation_signature = signature
+            changed = [name for name, generation in generations.items()
+                       if self._generations.get(name) != generation]
+            self._generations = generations
+            self._dirty.update(changed)
+        return changed
+
+    def _dataset_lock(self, name):
+        with self._lock:
+            return self._dataset_locks.setdefault(name, threading.RLock())
+
+    def warm_up(self, names=None):
+        """Load datasets on a background thread so later requests find them cached"""
+        names = list(names or self.datasets)
+
+        def load_all():
+            for name in names:
+                self.get(name)
+
+        thread = threading.Thread(target=load_all, name='datastore-warm-up', daemon=True)
+        thread.start()
+        return thread
+
+    def _save_columnar(self, name, df, signature):
+        if not self.columnar or signature is None:
+            return
+        try:
+            typed = optimize_dtypes(apply_schema(df.copy(), SCHEMAS.get(name, {})))
+            self._write_columnar(name, typed, signature)
+        except Exception as e:
+            print(f"Error writing columnar copy of {name}: {e}")
+
+    def append(self, name, rows):
+        """
+        Add rows to a dataset as a new immutable segment file.
+        Only the new rows are written, so the cost depends on the size of the
+        upload rather than of the dataset. `rows` is a DataFrame or an iterable
+        of chunks, written one at a time; if the iterable raises or holds no
+        rows, nothing is added. Returns the number of rows written.
+        """
+        chunks = [rows] if isinstance(rows, pd.DataFrame) else rows
+        directory = self.segment_dir(name)
+        os.makedirs(directory, exist_ok=True)
+        segment = '%020d-%d-%s.csv' % (time.time_ns(), os.getpid(), uuid.uuid4().hex[:8])
+        tmp_path = self._tmp_path(os.path.join(directory, segment))
+        written = 0
+        try:
+            for i, chunk in enumerate(chunks):
+                chunk.to_csv(tmp_path, index=False, mode='a' if i else 'w', header=not i)
+                written += len(chunk)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if not written and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        if os.path.exists(tmp_path):
+            os.replace(tmp_path, os.path.join(directory, segment))
+            self._bump_generation(name)
+        return written
+
+    def compact(self, name):
+        """
+        Fold a dataset's segments into its base file. Several workers may try
+        at once; the merged file only replaces the base if no other compaction
+        or save changed it in the meantime. Returns True if segments were merged.
+        """
+        base_signature, segments, df = self._read(name)
+        if not segments:
+            return False
+        path = self.path(name)
+        tmp_path = self._tmp_path(path)
+        df.to_csv(tmp_path, index=False)
+        with self._segment_lock(name, exclusive=True):
+            if self._base_signature(name) != base_signature or not set(segments) <= set(self._segments(name)):
+                os.remove(tmp_path)
+                return False
+            os.replace(tmp_path, path)
+            signature = self._base_signature(name)
+            for segment in segments:
+                os.remove(os.path.join(self.segment_dir(name), segment))
+        self._bump_generation(name)
+        self._save_columnar(name, df, signature)
+        return True
+
+    def start_compactor(self, interval=300, min_segments=1):
+        """Compact datasets with at least `min_segments` pending segments every `interval` seconds"""
+
+        def compact_all():
+            while True:
+                time.sleep(interval)
+                for name in self.datasets:
+                    if len(self._segments(name)) < min_segments:
+                        continue
+                    try:
+                        self.compact(name)
+                    except Exception as e:
+                        print(f"Error compacting {name}: {e}")
+
+        thread = threading.Thread(target=compact_all, name='datastore-compactor', daemon=True)
+        thread.start()
+        return thread
+
+    def signature(self, name):
+        """Signature of a dataset's files (base file plus segments), comparable across processes"""
+        return self._check(name)
+
+    def iter_chunks(self, name, chunksize=100000):
+        """
+        Stream a dataset's base file and segments as typed chunks, without
+        loading it whole. Only valid for datasets without a merge policy.
+        """
+        schema = SCHEMAS.get(name, {})
+        text_cols = {col: str for col, dtype in schema.items() if dtype == 'object'}
+        with self._segment_lock(name):
+            paths = [self.path(name)] if self._base_signature(name) is not None else []
+            paths += [os.path.join(self.segment_dir(name), segment) for segment in self._segments(name)]
+            for path in paths:
+                for chunk in pd.read_csv(path, dtype=text_cols, chunksize=chunksize):
+                    yield apply_schema(chunk, schema)
+
+    def dataset_version(self, name):
+        """Version at which a dataset's file or segments were last seen to change (does not load it)"""
+        self._check(name)
+        return self._versions[name]
+
+    def memory_report(self):
+        """Memory used by each loaded dataset versus its unoptimized equivalent"""
+        rows = []
+        with self._lock:
+            frames = {key: frame for key, (_, frame) in self._frames.items() if not isinstance(key, tuple)}
+        for name, frame in frames.items():
+            before = unoptimized_memory(frame)
+            after = frame.memory_usage(deep=True, index=False).sum()
+            rows.append({
+                'dataset': name,
+                'rows': len(frame),
+                'unoptimized_bytes': before,
+                'bytes': after,
+                'saved_bytes': before - after,
+                'saved_pct': (before - after) / before * 100 if before else 0.0,
+            })
+        return pd.DataFrame(rows, columns=['dataset', 'rows', 'unoptimized_bytes', 'bytes',
+                                           'saved_bytes', 'saved_pct'])
+
+    def refresh(self, names=None):
+        """Check every dataset (or only `names`) for changes and return the current data version"""
+        names = list(self.datasets if names is None else names)
+        with self._lock:
+            self._dirty.update(names)
+        for name in names:
+            self.get(name)
+        return self.version
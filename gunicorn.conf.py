@@ -0,0 +1,23 @@
+import gc
+import os
+
+# Preload mode: the master imports main.py once, loading every dataset and
+# materializing every view, and workers are forked from it. The snapshot is
+# shared copy-on-write, so boot time and memory stay roughly flat as workers
+# are added. Set PRELOAD_DATA=0 to have each worker load on its own instead.
+#
+# Swapping in a new snapshot: uploads reach every worker through the shared
+# generation file, but each worker then reloads the changed datasets into
+# private memory. To rebuild the shared snapshot without downtime, send USR2
+# to the master (it starts a new master + workers from a fresh import), then
+# WINCH and TERM to the old master once the new workers are serving.
+# A plain HUP does not re-import the app under preload.
+preload_app = os.environ.get('PRELOAD_DATA', '1') != '0'
+if preload_app:
+    os.environ['PRELOAD_DATA'] = '1'
+
+
+def pre_fork(server, worker):
+    # Move the preloaded objects to the permanent generation, so the cyclic
+    # GC in the workers never writes to (and un-shares) their pages
+    gc.freeze()
@@ -0,0 +1,75 @@
+import base64
+import io
+
+import pandas as pd
+
+from validation import describe_violations, merge_violations, validate_frame
+
+# Rows parsed (and validated) at a time from an uploaded CSV
+UPLOAD_CHUNK_ROWS = 50000
+
+# Base64 characters decoded at a time; must be a multiple of 4
+DECODE_BLOCK_CHARS = 1 << 20
+
+
+class UploadRejected(ValueError):
+    """Raised while streaming an upload that fails validation; nothing is stored"""
+
+    def __init__(self, violations):
+        super().__init__(describe_violations(violations))
+        self.violations = violations
+
+
+class Base64Stream(io.RawIOBase):
+    """
+    Binary file object over base64 text, decoded one block at a time so the
+    decoded payload is never held in memory as a whole
+    """
+
+    def __init__(self, encoded, start=0, block_chars=DECODE_BLOCK_CHARS):
+        self._encoded = encoded
+        self._pos = start
+        self._block_chars = block_chars
+        self._buffer = b''
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if not self._buffer:
+            if self._pos >= len(self._encoded):
+                return 0
+            end = self._pos + self._block_chars
+            self._buffer = base64.b64decode(self._encoded[self._pos:end])
+            self._pos = end
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+def read_upload(contents, chunksize=UPLOAD_CHUNK_ROWS):
+    """Iterate over a dcc.Upload CSV payload ('data:...;base64,...') as DataFrame chunks"""
+    start = contents.index(',') + 1
+    text = io.TextIOWrapper(io.BufferedReader(Base64Stream(contents, start)), encoding='utf-8')
+    return pd.read_csv(text, chunksize=chunksize)
+
+
+def validated_chunks(chunks, name, influencer_df):
+    """
+    Pass chunks through while they meet the upload schema of dataset `name`.
+    After a chunk fails, the remaining chunks are still validated (but not
+    passed on), and UploadRejected is raised at the end with the violations
+    of the whole upload.
+    """
+    violations = []
+    for chunk in chunks:
+        found = validate_frame(name, chunk, influencer_df)
+        if any(v['rule'] == 'required_columns' for v in found):
+            # Every chunk has the same header, so the rest would fail alike
+            raise UploadRejected(found)
+        violations = merge_violations(violations, found)
+        if not violations:
+            yield chunk
+    if violations:
+        raise UploadRejected(violations)
@@ -11,7 +11,18 @@ from plotly.subplots import make_subplots
 import plotly.figure_factory as ff
 import base64
 import io
+import json
 import zipfile
+import zlib
+import threading
+import flask
+from data_store import DERIVED_COLUMNS, DataStore, aggregate_payout_upload, payout_upsert_diff
+from views import ViewRegistry, summarize_tracking
+from cohorts import COHORT_COLUMNS, DEFAULT_LTV_WINDOW, LTV_WINDOWS, CohortLTV
+from ingest import UploadRejected, read_upload, validated_chunks
+from query_backend import SQLITE_LOAD_CHUNK_ROWS, PandasBackend, SQLiteBackend
+from callback_cache import cache_stats, memoize
+from paging import SortedTable
 try:
     import weasyprint
     PDF_EXPORT_AVAILABLE = True
@@ -214,668 +225,756 @@ app.index_string = '''
 </html>
 '''
 
-# Load data from CSV files
-payout_df = pd.read_csv('data/payouts.csv')
-influencer_df = pd.read_csv('data/influencers.csv')
-instagram_df = pd.read_csv('data/instagram_insights_data.csv')
-youtube_df = pd.read_csv('data/youtube_analytics_data.csv')
-tracking_df = pd.read_csv('data/tracking_data.csv')
-tracking_data_df = tracking_df  # Alias for CAC analysis
-posts_df = pd.read_csv('data/posts.csv')
+# All datasets are owned by a single store; callbacks fetch frames from it so
+# each CSV is parsed once and re-read only when the file on disk changes.
+# Frames returned by the store are shared - copy before mutating.
+# Only the datasets the layout needs are loaded at import; the rest load on
+# first use.
+store = DataStore('data')
+
+# Aggregates shared by several callbacks and exports are materialized once per
+# data version instead of being recomputed on every request.
+views = ViewRegistry(store)
+
+# Display callbacks are memoized per (inputs, data version) - see
+# callback_cache.memoize. Outputs that embed today's date are also recomputed
+# after DATE_DEPENDENT_TTL seconds.
+DATE_DEPENDENT_TTL = 3600
+
+# Row lookups (e.g. one influencer's tracking rows) go through a query backend:
+# boolean masks over the in-memory frames by default, or QUERY_BACKEND=sqlite
+# for indexed queries against data/healthkart.sqlite when data outgrows RAM.
+# `python query_backend.py` benchmarks both on the same lookups.
+QUERY_BACKEND = os.environ.get('QUERY_BACKEND', 'pandas')
+backend = SQLiteBackend(store) if QUERY_BACKEND == 'sqlite' else PandasBackend(store)
+
+# Under QUERY_BACKEND=sqlite these datasets are only ever queried through the
+# backend: they are not warmed up or preloaded into memory, and the views and
+# analytics over them aggregate in SQLite or stream from it.
+BACKEND_DATASETS = ('tracking',) if QUERY_BACKEND == 'sqlite' else ()
+IN_MEMORY_DATASETS = [name for name in store.datasets if name not in BACKEND_DATASETS]
+
+def build_cohort_ltv_from_backend(views):
+    """
+    cohort_ltv streamed from SQLite in date order, one chunk at a time. Rows
+    never predate a customer's first order, so every chunk folds in. The
+    table has no derived columns; CohortLTV computes month codes from dates.
+    """
+    cohort = CohortLTV()
+    columns = [col for col in COHORT_COLUMNS if col not in DERIVED_COLUMNS]
+    chunks = backend.query('SELECT %s FROM tracking ORDER BY date, rowid' % ', '.join(columns),
+                           name='tracking', chunksize=SQLITE_LOAD_CHUNK_ROWS)
+    for chunk in chunks:
+        cohort = cohort.add(chunk)
+    return cohort
+
+if QUERY_BACKEND == 'sqlite':
+    views.register('cohort_ltv', ('tracking',), build_cohort_ltv_from_backend)
+
+def tracking_product_totals():
+    """Orders, revenue and unique users per product in the tracking table"""
+    if QUERY_BACKEND == 'sqlite':
+        return backend.query('SELECT product, SUM(orders) AS orders, SUM(revenue) AS revenue, '
+                             'COUNT(DISTINCT user_id) AS user_id FROM tracking '
+                             'GROUP BY product ORDER BY product', name='tracking')
+    return store.get('tracking', columns=['product', 'orders', 'revenue', 'user_id']) \
+        .groupby('product', observed=True).agg({
+            'orders': 'sum',
+            'revenue': 'sum',
+            'user_id': 'nunique'  # unique users per product
+        }).reset_index()
 
-# Load additional data files
-try:
-    audience_demographics_df = pd.read_csv('data/audience_demographics.csv')
-    campaign_performance_df = pd.read_csv('data/campaign_performance_insights.csv')
-    geographic_distribution_df = pd.read_csv('data/geographic_distribution.csv')
-    posts_df = pd.read_csv('data/posts.csv')
-    tracking_codes_df = pd.read_csv('data/influencer_tracking_codes.csv')
-except Exception as e:
-    print(f"Error loading additional data: {e}")
-    # Create empty DataFrames if files don't exist
-    audience_demographics_df = pd.DataFrame()
-    campaign_performance_df = pd.DataFrame()
-    geographic_distribution_df = pd.DataFrame()
-    posts_df = pd.DataFrame()
-    tracking_codes_df = pd.DataFrame()
-
-
-# Calculate key metrics
-total_orders = payout_df['orders'].sum()
-total_revenue = payout_df['total_revenue'].sum()
-total_cost = payout_df['total_cost'].sum()
-total_roas = total_revenue / total_cost
-total_followers = influencer_df['follower_count'].sum()
-
-# For market reach, we'll use estimated impressions based on follower count
-# (In real implementation, you'd use the actual Instagram insights data)
-estimated_reach = total_followers * 0.4  # Assuming 40% organic reach rate
-
-# Define the app layout
-app.layout = html.Div([
-    # Beautiful Header with Gradient
-    html.Div([
+def tracking_unique_customers():
+    """Unique customers of each influencer in the tracking table"""
+    if QUERY_BACKEND == 'sqlite':
+        return backend.query('SELECT influencer_id, COUNT(DISTINCT user_id) AS unique_customers '
+                             'FROM tracking GROUP BY influencer_id', name='tracking')
+    return (store.get('tracking', columns=['influencer_id', 'user_id'])
+            .groupby('influencer_id', observed=True)['user_id']
+            .nunique()
+            .reset_index(name='unique_customers'))
+
+# Once a worker is serving, its first request starts a background warm-up of
+# the remaining datasets. Set WARM_UP_DATASETS=0 to load purely on demand.
+WARM_UP_DATASETS = os.environ.get('WARM_UP_DATASETS', '1') != '0'
+_warm_up_started = threading.Event()
+
+@server.before_request
+def start_data_warm_up():
+    if WARM_UP_DATASETS and not _warm_up_started.is_set():
+        _warm_up_started.set()
+        store.warm_up(IN_MEMORY_DATASETS)
+
+# Uploaded rows are stored as segment files; a background thread per worker
+# folds them into the base CSVs. Set COMPACT_INTERVAL_SECONDS=0 to disable.
+COMPACT_INTERVAL_SECONDS = int(os.environ.get('COMPACT_INTERVAL_SECONDS', '300'))
+_compactor_started = threading.Event()
+
+@server.before_request
+def start_segment_compactor():
+    if COMPACT_INTERVAL_SECONDS > 0 and not _compactor_started.is_set():
+        _compactor_started.set()
+        store.start_compactor(COMPACT_INTERVAL_SECONDS)
+
+# Uploads handled by another worker bump the shared generation file; one stat
+# per request tells this worker which datasets to reload.
+@server.before_request
+def sync_data_generation():
+    store.sync()
+
+# Diagnostics routes, served only with DEBUG_ROUTES=1. /debug/memory reports
+# the memory of each loaded dataset versus its unoptimized equivalent, and
+# /debug/cache the hit/miss/eviction counters of every memoized callback.
+DEBUG_ROUTES = os.environ.get('DEBUG_ROUTES', '0') == '1'
+
+@server.route('/debug/memory')
+def debug_memory_report():
+    if not DEBUG_ROUTES:
+        flask.abort(404)
+    return server.response_class(store.memory_report().to_json(orient='records'),
+                                 mimetype='application/json')
+
+@server.route('/debug/cache')
+def debug_cache_stats():
+    if not DEBUG_ROUTES:
+        flask.abort(404)
+    return flask.jsonify(cache_stats())
+
+# The layout is built per page load, so the header KPIs and the influencer
+# dropdown reflect uploads made since the worker started
+def serve_layout():
+    headline = views.get('headline_metrics')
+    total_orders = headline['total_orders']
+    total_revenue = headline['total_revenue']
+    total_cost = headline['total_cost']
+    total_roas = headline['total_roas']
+    total_followers = headline['total_followers']
+    estimated_reach = headline['estimated_reach']
+
+    # Define the app layout
+    return html.Div([
+        # Beautiful Header with Gradient
         html.Div([
             html.Div([
-                html.H1("HealthKart Influencer Campaign Dashboard", 
-                       style={'margin': '0', 'fontSize': '3em', 'fontWeight': '700'}),
-                html.P("Comprehensive Analytics & Performance Insights", 
-                       style={'margin': '10px 0 0 0', 'fontSize': '1.2em', 'opacity': '0.9'})
-            ], style={'flex': '1'}),
+                html.Div([
+                    html.H1("HealthKart Influencer Campaign Dashboard", 
+                           style={'margin': '0', 'fontSize': '3em', 'fontWeight': '700'}),
+                    html.P("Comprehensive Analytics & Performance Insights", 
+                           style={'margin': '10px 0 0 0', 'fontSize': '1.2em', 'opacity': '0.9'})
+                ], style={'flex': '1'}),
             
-            # Export Buttons
-            html.Div([
-                html.Button([
-                    html.I(className="fas fa-file-pdf", style={'marginRight': '8px'}),
-                    "Export to PDF"
-                ], id='export-pdf-btn', 
-                   style={
-                       'backgroundColor': '#e74c3c', 'color': 'white', 'border': 'none',
-                       'padding': '12px 20px', 'borderRadius': '8px', 'cursor': 'pointer',
-                       'fontSize': '1em', 'fontWeight': '600', 'marginRight': '10px',
-                       'boxShadow': '0 4px 15px rgba(231,76,60,0.3)',
-                       'transition': 'all 0.3s ease'
-                   }),
-                html.Button([
-                    html.I(className="fas fa-file-csv", style={'marginRight': '8px'}),
-                    "Export Data to CSV"
-                ], id='export-csv-btn',
-                   style={
-                       'backgroundColor': '#27ae60', 'color': 'white', 'border': 'none',
-                       'padding': '12px 20px', 'borderRadius': '8px', 'cursor': 'pointer',
-                       'fontSize': '1em', 'fontWeight': '600', 'marginRight': '10px',
-                       'boxShadow': '0 4px 15px rgba(39,174,96,0.3)',
-                       'transition': 'all 0.3s ease'
-                   }),
-                html.Button([
-                    html.I(className="fas fa-chart-line", style={'marginRight': '8px'}),
-                    "Insights Summary"
-                ], id='insights-summary-btn',
-                   style={
-                       'backgroundColor': '#3498db', 'color': 'white', 'border': 'none',
-                       'padding': '12px 20px', 'borderRadius': '8px', 'cursor': 'pointer',
-                       'fontSize': '1em', 'fontWeight': '600',
-                       'boxShadow': '0 4px 15px rgba(52,152,219,0.3)',
-                       'transition': 'all 0.3s ease'
-                   })
-            ], style={'display': 'flex', 'alignItems': 'center'})
-        ], style={'display': 'flex', 'justifyContent': 'space-between', 'alignItems': 'center'})
-    ], className='header-gradient'),
-
-    # Main Dashboard Container
-    html.Div([
-        # Top Performing Products Section
+                # Export Buttons
+                html.Div([
+                    html.Button([
+                        html.I(className="fas fa-file-pdf", style={'marginRight': '8px'}),
+                        "Export to PDF"
+                    ], id='export-pdf-btn', 
+                       style={
+                           'backgroundColor': '#e74c3c', 'color': 'white', 'border': 'none',
+                           'padding': '12px 20px', 'borderRadius': '8px', 'cursor': 'pointer',
+                           'fontSize': '1em', 'fontWeight': '600', 'marginRight': '10px',
+                           'boxShadow': '0 4px 15px rgba(231,76,60,0.3)',
+                           'transition': 'all 0.3s ease'
+                       }),
+                    html.Button([
+                        html.I(className="fas fa-file-csv", style={'marginRight': '8px'}),
+                        "Export Data to CSV"
+                    ], id='export-csv-btn',
+                       style={
+                           'backgroundColor': '#27ae60', 'color': 'white', 'border': 'none',
+                           'padding': '12px 20px', 'borderRadius': '8px', 'cursor': 'pointer',
+                           'fontSize': '1em', 'fontWeight': '600', 'marginRight': '10px',
+                           'boxShadow': '0 4px 15px rgba(39,174,96,0.3)',
+                           'transition': 'all 0.3s ease'
+                       }),
+                    html.Button([
+                        html.I(className="fas fa-chart-line", style={'marginRight': '8px'}),
+                        "Insights Summary"
+                    ], id='insights-summary-btn',
+                       style={
+                           'backgroundColor': '#3498db', 'color': 'white', 'border': 'none',
+                           'padding': '12px 20px', 'borderRadius': '8px', 'cursor': 'pointer',
+                           'fontSize': '1em', 'fontWeight': '600',
+                           'boxShadow': '0 4px 15px rgba(52,152,219,0.3)',
+                           'transition': 'all 0.3s ease'
+                       })
+                ], style={'display': 'flex', 'alignItems': 'center'})
+            ], style={'display': 'flex', 'justifyContent': 'space-between', 'alignItems': 'center'})
+        ], className='header-gradient'),
+
+        # Main Dashboard Container
         html.Div([
-            html.H3("🏆 Top Performing Products", 
-                   style={'margin': '0 0 15px 0', 'fontSize': '1.4em', 'fontWeight': '600'}),
-            html.Div(id='top-products-display')
-        ], className='top-products-container'),
+            # Top Performing Products Section
+            html.Div([
+                html.H3("🏆 Top Performing Products", 
+                       style={'margin': '0 0 15px 0', 'fontSize': '1.4em', 'fontWeight': '600'}),
+                html.Div(id='top-products-display')
+            ], className='top-products-container'),
 
-        # Key Metrics Cards
-        html.Div([
-            # Market Reach Card
+            # Key Metrics Cards
             html.Div([
+                # Market Reach Card
                 html.Div([
-                    html.I(className="fas fa-users", 
-                          style={'fontSize': '2em', 'color': '#3498db', 'marginBottom': '10px'}),
-                    html.H3("Market Reach", style={'color': '#2c3e50', 'margin': '0 0 10px 0'}),
-                    html.Div(f"{estimated_reach:,.0f}", className='kpi-number', style={'color': '#3498db'}),
-                    html.P(f"Total Followers: {total_followers:,}", 
-                          style={'margin': '0', 'color': '#7f8c8d', 'fontSize': '0.9em'})
-                ])
-            ], className='metric-card', style={'width': '30%', 'display': 'inline-block'}),
+                    html.Div([
+                        html.I(className="fas fa-users", 
+                              style={'fontSize': '2em', 'color': '#3498db', 'marginBottom': '10px'}),
+                        html.H3("Market Reach", style={'color': '#2c3e50', 'margin': '0 0 10px 0'}),
+                        html.Div(f"{estimated_reach:,.0f}", className='kpi-number', style={'color': '#3498db'}),
+                        html.P(f"Total Followers: {total_followers:,}", 
+                              style={'margin': '0', 'color': '#7f8c8d', 'fontSize': '0.9em'})
+                    ])
+                ], className='metric-card', style={'width': '30%', 'display': 'inline-block'}),
 
-            # Total Orders Card
-            html.Div([
+                # Total Orders Card
                 html.Div([
-                    html.I(className="fas fa-shopping-cart", 
-                          style={'fontSize': '2em', 'color': '#27ae60', 'marginBottom': '10px'}),
-                    html.H3("Total Orders", style={'color': '#2c3e50', 'margin': '0 0 10px 0'}),
-                    html.Div(f"{total_orders:,}", className='kpi-number', style={'color': '#27ae60'}),
-                    html.P("Across all campaigns", 
-                          style={'margin': '0', 'color': '#7f8c8d', 'fontSize': '0.9em'})
-                ])
-            ], className='metric-card', style={'width': '30%', 'display': 'inline-block'}),
+                    html.Div([
+                        html.I(className="fas fa-shopping-cart", 
+                              style={'fontSize': '2em', 'color': '#27ae60', 'marginBottom': '10px'}),
+                        html.H3("Total Orders", style={'color': '#2c3e50', 'margin': '0 0 10px 0'}),
+                        html.Div(f"{total_orders:,}", className='kpi-number', style={'color': '#27ae60'}),
+                        html.P("Across all campaigns", 
+                              style={'margin': '0', 'color': '#7f8c8d', 'fontSize': '0.9em'})
+                    ])
+                ], className='metric-card', style={'width': '30%', 'display': 'inline-block'}),
 
-            # ROAS Card
-            html.Div([
+                # ROAS Card
                 html.Div([
-                    html.I(className="fas fa-chart-line", 
-                          style={'fontSize': '2em', 'color': '#e74c3c', 'marginBottom': '10px'}),
-                    html.H3("Overall ROAS", style={'color': '#2c3e50', 'margin': '0 0 10px 0'}),
-                    html.Div(f"{total_roas:.2f}x", className='kpi-number', style={'color': '#e74c3c'}),
-                    html.P(f"ROI: {((total_roas-1)*100):.0f}%", 
-                          style={'margin': '0', 'color': '#7f8c8d', 'fontSize': '0.9em'})
-                ])
-            ], className='metric-card', style={'width': '30%', 'display': 'inline-block'})
-        ], style={'textAlign': 'center', 'marginBottom': '20px'}),
+                    html.Div([
+                        html.I(className="fas fa-chart-line", 
+                              style={'fontSize': '2em', 'color': '#e74c3c', 'marginBottom': '10px'}),
+                        html.H3("Overall ROAS", style={'color': '#2c3e50', 'margin': '0 0 10px 0'}),
+                        html.Div(f"{total_roas:.2f}x", className='kpi-number', style={'color': '#e74c3c'}),
+                        html.P(f"ROI: {((total_roas-1)*100):.0f}%", 
+                              style={'margin': '0', 'color': '#7f8c8d', 'fontSize': '0.9em'})
+                    ])
+                ], className='metric-card', style={'width': '30%', 'display': 'inline-block'})
+            ], style={'textAlign': 'center', 'marginBottom': '20px'}),
 
-        # Revenue and Cost Breakdown
-        html.Div([
-            html.H3("Financial Overview", className='section-title'),
+            # Revenue and Cost Breakdown
             html.Div([
+                html.H3("Financial Overview", className='section-title'),
                 html.Div([
-                    html.I(className="fas fa-arrow-up", style={'color': '#27ae60', 'marginRight': '10px'}),
-                    html.H4("Total Revenue", style={'color': '#27ae60', 'margin': '0 0 10px 0'}),
-                    html.H3(f"₹{total_revenue:,.2f}", style={'color': '#2c3e50', 'margin': '0'})
-                ], style={'width': '45%', 'display': 'inline-block', 'textAlign': 'center'}),
-                html.Div([
-                    html.I(className="fas fa-arrow-down", style={'color': '#e74c3c', 'marginRight': '10px'}),
-                    html.H4("Total Cost", style={'color': '#e74c3c', 'margin': '0 0 10px 0'}),
-                    html.H3(f"₹{total_cost:,.2f}", style={'color': '#2c3e50', 'margin': '0'})
-                ], style={'width': '45%', 'display': 'inline-block', 'textAlign': 'center'})
-            ])
-        ], className='section-container'),
+                    html.Div([
+                        html.I(className="fas fa-arrow-up", style={'color': '#27ae60', 'marginRight': '10px'}),
+                        html.H4("Total Revenue", style={'color': '#27ae60', 'margin': '0 0 10px 0'}),
+                        html.H3(f"₹{total_revenue:,.2f}", style={'color': '#2c3e50', 'margin': '0'})
+                    ], style={'width': '45%', 'display': 'inline-block', 'textAlign': 'center'}),
+                    html.Div([
+                        html.I(className="fas fa-arrow-down", style={'color': '#e74c3c', 'marginRight': '10px'}),
+                        html.H4("Total Cost", style={'color': '#e74c3c', 'margin': '0 0 10px 0'}),
+                        html.H3(f"₹{total_cost:,.2f}", style={'color': '#2c3e50', 'margin': '0'})
+                    ], style={'width': '45%', 'display': 'inline-block', 'textAlign': 'center'})
+                ])
+            ], className='section-container'),
 
-        # Campaign Performance Section
-        html.Div([
-            html.H3("Campaign Performance Overview", className='section-title'),
-            
-            # Campaign KPI Cards
+            # Campaign Performance Section
             html.Div([
-                html.Div(id='campaign-kpi-cards'),
-            ], style={'marginBottom': '30px'}),
+                html.H3("Campaign Performance Overview", className='section-title'),
             
-            # Campaign Performance Charts
-            html.Div([
-                # Brand Performance Chart
+                # Campaign KPI Cards
                 html.Div([
-                    dcc.Graph(id='brand-performance-chart')
-                ], style={'width': '100%', 'display': 'inline-block'}),
+                    html.Div(id='campaign-kpi-cards'),
+                ], style={'marginBottom': '30px'}),
+            
+                # Campaign Performance Charts
+                html.Div([
+                    # Brand Performance Chart
+                    html.Div([
+                        dcc.Graph(id='brand-performance-chart')
+                    ], style={'width': '100%', 'display': 'inline-block'}),
                 
                
-            ])
-        ], className='section-container'),
+                ])
+            ], className='section-container'),
 
-        # Payout Tracking Section
-        html.Div([
-            html.H3("Payout Tracking & Management", className='section-title'),
-            
-            # Payout Summary Cards
+            # Payout Tracking Section
             html.Div([
-                html.Div(id='payout-summary-cards')
-            ], style={'marginBottom': '20px'}),
+                html.H3("Payout Tracking & Management", className='section-title'),
+            
+                # Payout Summary Cards
+                html.Div([
+                    html.Div(id='payout-summary-cards')
+                ], style={'marginBottom': '20px'}),
             
-            # Payout Details Table
+                # Payout Details Table
+                html.Div([
+                    html.H4("Recent Payouts", style={'color': '#2c3e50', 'marginBottom': '15px'}),
+                    dash_table.DataTable(
+                        id='payout-tracking-table',
+                        columns=[
+                            {'name': 'Influencer', 'id': 'influencer_name'},
+                            {'name': 'Brand', 'id': 'brand'},
+                            {'name': 'Platform', 'id': 'platform'},
+                            {'name': 'Payment Type', 'id': 'payment_type'},
+                            {'name': 'Orders', 'id': 'orders', 'type': 'numeric', 'format': {'specifier': ',.0f'}},
+                            {'name': 'Amount (₹)', 'id': 'payout_amount', 'type': 'numeric', 'format': {'specifier': ',.2f'}},
+                            {'name': 'Status', 'id': 'status'},
+                            {'name': 'Date', 'id': 'payout_date'}
+                        ],
+                        style_cell={'textAlign': 'center', 'padding': '12px', 'fontFamily': 'Inter'},
+                        style_header={'backgroundColor': '#34495e', 'color': 'white', 'fontWeight': 'bold'},
+                        style_data_conditional=[
+                            {
+                                'if': {'filter_query': '{status} = Paid'},
+                                'backgroundColor': '#d5f4e6',
+                                'color': 'black',
+                            },
+                            {
+                                'if': {'filter_query': '{status} = Pending'},
+                                'backgroundColor': '#fff3cd',
+                                'color': 'black',
+                            },
+                            {
+                                'if': {'filter_query': '{status} = Processing'},
+                                'backgroundColor': '#cce7ff',
+                                'color': 'black',
+                            }
+                        ],
+                        # Pages are sorted and filtered on the server (see payout_ledger)
+                        page_current=0,
+                        page_size=10,
+                        page_action='custom',
+                        sort_action='custom',
+                        sort_mode='single',
+                        sort_by=[],
+                        filter_action='custom',
+                        filter_query=''
+                    )
+                ])
+            ], className='section-container'),
+
+            # Platform and Category Breakdown Charts
             html.Div([
-                html.H4("Recent Payouts", style={'color': '#2c3e50', 'marginBottom': '15px'}),
+                # Platform chart
+                html.Div([
+                    dcc.Graph(id='platform-chart')
+                ], style={'width': '48%', 'display': 'inline-block'}),
+
+                # Category chart
+                html.Div([
+                    dcc.Graph(id='category-chart')
+                ], style={'width': '48%', 'display': 'inline-block', 'marginLeft': '4%'})
+            ], className='section-container'),
+
+            # Top Performers Table
+            html.Div([
+                html.H3("Top Performing Influencers", className='section-title'),
                 dash_table.DataTable(
-                    id='payout-tracking-table',
+                    id='top-performers-table',
                     columns=[
-                        {'name': 'Influencer', 'id': 'influencer_name'},
-                        {'name': 'Brand', 'id': 'brand'},
+                        {'name': 'Influencer', 'id': 'name'},
+                        {'name': 'Category', 'id': 'category'},
                         {'name': 'Platform', 'id': 'platform'},
-                        {'name': 'Payment Type', 'id': 'payment_type'},
                         {'name': 'Orders', 'id': 'orders', 'type': 'numeric', 'format': {'specifier': ',.0f'}},
-                        {'name': 'Amount (₹)', 'id': 'payout_amount', 'type': 'numeric', 'format': {'specifier': ',.2f'}},
-                        {'name': 'Status', 'id': 'status'},
-                        {'name': 'Date', 'id': 'payout_date'}
+                        {'name': 'Revenue (₹)', 'id': 'total_revenue', 'type': 'numeric', 'format': {'specifier': ',.2f'}},
+                        {'name': 'ROAS', 'id': 'roas', 'type': 'numeric', 'format': {'specifier': '.2f'}}
                     ],
                     style_cell={'textAlign': 'center', 'padding': '12px', 'fontFamily': 'Inter'},
-                    style_header={'backgroundColor': '#34495e', 'color': 'white', 'fontWeight': 'bold'},
+                    style_header={'backgroundColor': '#3498db', 'color': 'white', 'fontWeight': 'bold'},
                     style_data_conditional=[
                         {
-                            'if': {'filter_query': '{status} = Paid'},
+                            'if': {'filter_query': '{roas} > 10'},
                             'backgroundColor': '#d5f4e6',
                             'color': 'black',
-                        },
-                        {
-                            'if': {'filter_query': '{status} = Pending'},
-                            'backgroundColor': '#fff3cd',
-                            'color': 'black',
-                        },
-                        {
-                            'if': {'filter_query': '{status} = Processing'},
-                            'backgroundColor': '#cce7ff',
-                            'color': 'black',
                         }
                     ],
+                    # Pages are sorted and filtered on the server (see performer_table)
+                    page_current=0,
                     page_size=10,
-                    sort_action='native'
+                    page_action='custom',
+                    sort_action='custom',
+                    sort_mode='single',
+                    sort_by=[],
+                    filter_action='custom',
+                    filter_query=''
                 )
-            ])
-        ], className='section-container'),
-
-        # Platform and Category Breakdown Charts
-        html.Div([
-            # Platform chart
-            html.Div([
-                dcc.Graph(id='platform-chart')
-            ], style={'width': '48%', 'display': 'inline-block'}),
-
-            # Category chart
-            html.Div([
-                dcc.Graph(id='category-chart')
-            ], style={'width': '48%', 'display': 'inline-block', 'marginLeft': '4%'})
-        ], className='section-container'),
-
-        # Top Performers Table
-        html.Div([
-            html.H3("Top Performing Influencers", className='section-title'),
-            dash_table.DataTable(
-                id='top-performers-table',
-                columns=[
-                    {'name': 'Influencer', 'id': 'name'},
-                    {'name': 'Category', 'id': 'category'},
-                    {'name': 'Platform', 'id': 'platform'},
-                    {'name': 'Orders', 'id': 'orders', 'type': 'numeric', 'format': {'specifier': ',.0f'}},
-                    {'name': 'Revenue (₹)', 'id': 'total_revenue', 'type': 'numeric', 'format': {'specifier': ',.2f'}},
-                    {'name': 'ROAS', 'id': 'roas', 'type': 'numeric', 'format': {'specifier': '.2f'}}
-                ],
-                style_cell={'textAlign': 'center', 'padding': '12px', 'fontFamily': 'Inter'},
-                style_header={'backgroundColor': '#3498db', 'color': 'white', 'fontWeight': 'bold'},
-                style_data_conditional=[
-                    {
-                        'if': {'filter_query': '{roas} > 10'},
-                        'backgroundColor': '#d5f4e6',
-                        'color': 'black',
-                    }
-                ],
-                page_size=10,
-                sort_action='native'
-            )
-        ], className='section-container'),
+            ], className='section-container'),
         
-        # Influencer Performance Deep Dive
-        html.Div([
-            html.H3("Influencer Performance Deep Dive", className='section-title'),
-            
-            # Influencer Selector
+            # Influencer Performance Deep Dive
             html.Div([
-                html.Label("Select Influencer:", style={'fontWeight': 'bold', 'color': '#2c3e50', 'fontSize': '1.1em'}),
-                dcc.Dropdown(
-                    id='influencer-dropdown',
-                    options=[
-                        {'label': row['name'], 'value': row['influencer_id']} 
-                        for _, row in influencer_df.iterrows()
-                    ],
-                    value='HK001',  # Default to first influencer
-                    style={'marginTop': '15px', 'borderRadius': '8px'}
-                )
-            ], style={'width': '40%', 'margin': '0 auto', 'marginBottom': '30px'}),
+                html.H3("Influencer Performance Deep Dive", className='section-title'),
             
-            # Platform-specific KPIs in beautiful cards
-            html.Div(id='platform-kpis-container')
+                # Influencer Selector
+                html.Div([
+                    html.Label("Select Influencer:", style={'fontWeight': 'bold', 'color': '#2c3e50', 'fontSize': '1.1em'}),
+                    dcc.Dropdown(
+                        id='influencer-dropdown',
+                        options=[
+                            {'label': row['name'], 'value': row['influencer_id']} 
+                            for _, row in store.get('influencers').iterrows()
+                        ],
+                        value='HK001',  # Default to first influencer
+                        style={'marginTop': '15px', 'borderRadius': '8px'}
+                    )
+                ], style={'width': '40%', 'margin': '0 auto', 'marginBottom': '30px'}),
             
-        ], className='section-container'),
-
-        # Overall Platform KPIs
-        html.Div([
-            html.H3("Platform Performance Overview", className='section-title'),
+                # Platform-specific KPIs in beautiful cards
+                html.Div(id='platform-kpis-container')
             
+            ], className='section-container'),
+
+            # Overall Platform KPIs
             html.Div([
-                # Instagram KPIs
+                html.H3("Platform Performance Overview", className='section-title'),
+            
                 html.Div([
+                    # Instagram KPIs
                     html.Div([
                         html.Div([
-                            html.I(className="fab fa-instagram", style={'fontSize': '2em', 'color': '#E4405F', 'marginBottom': '10px'}),
-                            html.H4("Instagram", style={'color': '#E4405F', 'margin': '0'})
-                        ], style={'textAlign': 'center', 'marginBottom': '20px'}),
+                            html.Div([
+                                html.I(className="fab fa-instagram", style={'fontSize': '2em', 'color': '#E4405F', 'marginBottom': '10px'}),
+                                html.H4("Instagram", style={'color': '#E4405F', 'margin': '0'})
+                            ], style={'textAlign': 'center', 'marginBottom': '20px'}),
                         
-                        html.Div(id='instagram-kpis-cards')
-                    ], style={
-                        'backgroundColor': 'white',
-                        'padding': '25px',
-                        'borderRadius': '15px',
-                        'boxShadow': '0 4px 15px rgba(228, 64, 95, 0.1)',
-                        'border': '2px solid #E4405F20'
-                    })
-                ], style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top'}),
+                            html.Div(id='instagram-kpis-cards')
+                        ], style={
+                            'backgroundColor': 'white',
+                            'padding': '25px',
+                            'borderRadius': '15px',
+                            'boxShadow': '0 4px 15px rgba(228, 64, 95, 0.1)',
+                            'border': '2px solid #E4405F20'
+                        })
+                    ], style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top'}),
                 
-                # YouTube KPIs
-                html.Div([
+                    # YouTube KPIs
                     html.Div([
                         html.Div([
-                            html.I(className="fab fa-youtube", style={'fontSize': '2em', 'color': '#FF0000', 'marginBottom': '10px'}),
-                            html.H4("YouTube", style={'color': '#FF0000', 'margin': '0'})
-                        ], style={'textAlign': 'center', 'marginBottom': '20px'}),
+                            html.Div([
+                                html.I(className="fab fa-youtube", style={'fontSize': '2em', 'color': '#FF0000', 'marginBottom': '10px'}),
+                                html.H4("YouTube", style={'color': '#FF0000', 'margin': '0'})
+                            ], style={'textAlign': 'center', 'marginBottom': '20px'}),
                         
-                        html.Div(id='youtube-kpis-cards')
-                    ], style={
-                        'backgroundColor': 'white',
-                        'padding': '25px',
-                        'borderRadius': '15px',
-                        'boxShadow': '0 4px 15px rgba(255, 0, 0, 0.1)',
-                        'border': '2px solid #FF000020'
-                    })
-                ], style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top', 'marginLeft': '4%'})
+                            html.Div(id='youtube-kpis-cards')
+                        ], style={
+                            'backgroundColor': 'white',
+                            'padding': '25px',
+                            'borderRadius': '15px',
+                            'boxShadow': '0 4px 15px rgba(255, 0, 0, 0.1)',
+                            'border': '2px solid #FF000020'
+                        })
+                    ], style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top', 'marginLeft': '4%'})
                 
-            ])
-        ], className='section-container'),
+                ])
+            ], className='section-container'),
         
-        # ---------- ADVANCED ANALYTICS SECTION ----------
-        html.Hr(style={'margin': '40px 0', 'border': 'none', 'height': '2px', 'background': 'linear-gradient(135deg, #667eea, #764ba2)'}),
+            # ---------- ADVANCED ANALYTICS SECTION ----------
+            html.Hr(style={'margin': '40px 0', 'border': 'none', 'height': '2px', 'background': 'linear-gradient(135deg, #667eea, #764ba2)'}),
         
-        html.Div([
-            html.H2("Advanced Analytics", className='section-title',
-                    style={'fontSize': '2.5em', 'fontWeight': '300'}),
-            
-            dcc.Tabs(id='advanced-tabs', value='audience-growth', 
-                     className='tab-container',
-                     children=[
-                     dcc.Tab(label='Audience Growth', value='audience-growth',
-                            style={
-                                'padding': '15px 30px',
-                                'fontWeight': 'bold',
-                                'fontSize': '14px',
-                                'borderRadius': '5px 5px 0 0',
-                                'backgroundColor': '#f8f9fa',
-                                'border': '1px solid #dee2e6',
-                                'color': '#495057'
-                            },
-                            selected_style={
-                                'padding': '15px 30px',
-                                'fontWeight': 'bold',
-                                'fontSize': '14px',
-                                'borderRadius': '5px 5px 0 0',
-                                'backgroundColor': '#3498db',
-                                'border': '1px solid #3498db',
-                                'color': 'white'
-                            }),
-                     dcc.Tab(label='Incremental ROAS', value='incremental-roas',
-                            style={
-                                'padding': '15px 30px',
-                                'fontWeight': 'bold',
-                                'fontSize': '14px',
-                                'borderRadius': '5px 5px 0 0',
-                                'backgroundColor': '#f8f9fa',
-                                'border': '1px solid #dee2e6',
-                                'color': '#495057'
-                            },
-                            selected_style={
-                                'padding': '15px 30px',
-                                'fontWeight': 'bold',
-                                'fontSize': '14px',
-                                'borderRadius': '5px 5px 0 0',
-                                'backgroundColor': '#e74c3c',
-                                'border': '1px solid #e74c3c',
-                                'color': 'white'
-                            }),
-                     dcc.Tab(label='Product Affinity', value='product-affinity',
-                            style={
-                                'padding': '15px 30px',
-                                'fontWeight': 'bold',
-                                'fontSize': '14px',
-                                'borderRadius': '5px 5px 0 0',
-                                'backgroundColor': '#f8f9fa',
-                                'border': '1px solid #dee2e6',
-                                'color': '#495057'
-                            },
-                            selected_style={
-                                'padding': '15px 30px',
-                                'fontWeight': 'bold',
-                                'fontSize': '14px',
-                                'borderRadius': '5px 5px 0 0',
-                                'backgroundColor': '#27ae60',
-                                'border': '1px solid #27ae60',
-                                'color': 'white'
-                            }),
-                     dcc.Tab(label='Geo Efficiency', value='geo-efficiency',
-                            style={
-                                'padding': '15px 30px',
-                                'fontWeight': 'bold',
-                                'fontSize': '14px',
-                                'borderRadius': '5px 5px 0 0',
-                                'backgroundColor': '#f8f9fa',
-                                'border': '1px solid #dee2e6',
-                                'color': '#495057'
-                            },
-                            selected_style={
-                                'padding': '15px 30px',
-                                'fontWeight': 'bold',
-                                'fontSize': '14px',
-                                'borderRadius': '5px 5px 0 0',
-                                'backgroundColor': '#f39c12',
-                                'border': '1px solid #f39c12',
-                                'color': 'white'
-                            }),
-                     dcc.Tab(label='Lifetime Lift', value='lifetime-lift',
-                            style={
-                                'padding': '15px 30px',
-                                'fontWeight': 'bold',
-                                'fontSize': '14px',
-                                'borderRadius': '5px 5px 0 0',
-                                'backgroundColor': '#f8f9fa',
-                                'border': '1px solid #dee2e6',
-                                'color': '#495057'
-                            },
-                            selected_style={
-                                'padding': '15px 30px',
-                                'fontWeight': 'bold',
-                                'fontSize': '14px',
-                                'borderRadius': '5px 5px 0 0',
-                                'backgroundColor': '#9b59b6',
-                                'border': '1px solid #9b59b6',
-                                'color': 'white'
-                            }),
-                     dcc.Tab(label='💸 CAC Analysis', value='cac-analysis',
-                            style={
-                                'padding': '15px 30px',
-                                'fontWeight': 'bold',
-                                'fontSize': '14px',
-                                'borderRadius': '5px 5px 0 0',
-                                'backgroundColor': '#f8f9fa',
-                                'border': '1px solid #dee2e6',
-                                'color': '#495057'
-                            },
-                            selected_style={
-                                'padding': '15px 30px',
-                                'fontWeight': 'bold',
-                                'fontSize': '14px',
-                                'borderRadius': '5px 5px 0 0',
-                                'backgroundColor': '#e67e22',
-                                'border': '1px solid #e67e22',
-                                'color': 'white'
-                            }),
-                 ]),
+            html.Div([
+                html.H2("Advanced Analytics", className='section-title',
+                        style={'fontSize': '2.5em', 'fontWeight': '300'}),
+            
+                dcc.Tabs(id='advanced-tabs', value='audience-growth', 
+                         className='tab-container',
+                         children=[
+                         dcc.Tab(label='Audience Growth', value='audience-growth',
+                                style={
+                                    'padding': '15px 30px',
+                                    'fontWeight': 'bold',
+                                    'fontSize': '14px',
+                                    'borderRadius': '5px 5px 0 0',
+                                    'backgroundColor': '#f8f9fa',
+                                    'border': '1px solid #dee2e6',
+                                    'color': '#495057'
+                                },
+                                selected_style={
+                                    'padding': '15px 30px',
+                                    'fontWeight': 'bold',
+                                    'fontSize': '14px',
+                                    'borderRadius': '5px 5px 0 0',
+                                    'backgroundColor': '#3498db',
+                                    'border': '1px solid #3498db',
+                                    'color': 'white'
+                                }),
+                         dcc.Tab(label='Incremental ROAS', value='incremental-roas',
+                                style={
+                                    'padding': '15px 30px',
+                                    'fontWeight': 'bold',
+                                    'fontSize': '14px',
+                                    'borderRadius': '5px 5px 0 0',
+                                    'backgroundColor': '#f8f9fa',
+                                    'border': '1px solid #dee2e6',
+                                    'color': '#495057'
+                                },
+                                selected_style={
+                                    'padding': '15px 30px',
+                                    'fontWeight': 'bold',
+                                    'fontSize': '14px',
+                                    'borderRadius': '5px 5px 0 0',
+                                    'backgroundColor': '#e74c3c',
+                                    'border': '1px solid #e74c3c',
+                                    'color': 'white'
+                                }),
+                         dcc.Tab(label='Product Affinity', value='product-affinity',
+                                style={
+                                    'padding': '15px 30px',
+                                    'fontWeight': 'bold',
+                                    'fontSize': '14px',
+                                    'borderRadius': '5px 5px 0 0',
+                                    'backgroundColor': '#f8f9fa',
+                                    'border': '1px solid #dee2e6',
+                                    'color': '#495057'
+                                },
+                                selected_style={
+                                    'padding': '15px 30px',
+                                    'fontWeight': 'bold',
+                                    'fontSize': '14px',
+                                    'borderRadius': '5px 5px 0 0',
+                                    'backgroundColor': '#27ae60',
+                                    'border': '1px solid #27ae60',
+                                    'color': 'white'
+                                }),
+                         dcc.Tab(label='Geo Efficiency', value='geo-efficiency',
+                                style={
+                                    'padding': '15px 30px',
+                                    'fontWeight': 'bold',
+                                    'fontSize': '14px',
+                                    'borderRadius': '5px 5px 0 0',
+                                    'backgroundColor': '#f8f9fa',
+                                    'border': '1px solid #dee2e6',
+                                    'color': '#495057'
+                                },
+                                selected_style={
+                                    'padding': '15px 30px',
+                                    'fontWeight': 'bold',
+                                    'fontSize': '14px',
+                                    'borderRadius': '5px 5px 0 0',
+                                    'backgroundColor': '#f39c12',
+                                    'border': '1px solid #f39c12',
+                                    'color': 'white'
+                                }),
+                         dcc.Tab(label='Lifetime Lift', value='lifetime-lift',
+                                style={
+                                    'padding': '15px 30px',
+                                    'fontWeight': 'bold',
+                                    'fontSize': '14px',
+                                    'borderRadius': '5px 5px 0 0',
+                                    'backgroundColor': '#f8f9fa',
+                                    'border': '1px solid #dee2e6',
+                                    'color': '#495057'
+                                },
+                                selected_style={
+                                    'padding': '15px 30px',
+                                    'fontWeight': 'bold',
+                                    'fontSize': '14px',
+                                    'borderRadius': '5px 5px 0 0',
+                                    'backgroundColor': '#9b59b6',
+                                    'border': '1px solid #9b59b6',
+                                    'color': 'white'
+                                }),
+                         dcc.Tab(label='💸 CAC Analysis', value='cac-analysis',
+                                style={
+                                    'padding': '15px 30px',
+                                    'fontWeight': 'bold',
+                                    'fontSize': '14px',
+                                    'borderRadius': '5px 5px 0 0',
+                                    'backgroundColor': '#f8f9fa',
+                                    'border': '1px solid #dee2e6',
+                                    'color': '#495057'
+                                },
+                                selected_style={
+                                    'padding': '15px 30px',
+                                    'fontWeight': 'bold',
+                                    'fontSize': '14px',
+                                    'borderRadius': '5px 5px 0 0',
+                                    'backgroundColor': '#e67e22',
+                                    'border': '1px solid #e67e22',
+                                    'color': 'white'
+                                }),
+                     ]),
         
-        html.Div(id='advanced-content')
+            html.Div(id='advanced-content')
         
-    ], style={
-        'backgroundColor': 'white',
-        'padding': '30px',
-        'margin': '20px',
-        'borderRadius': '15px',
-        'boxShadow': '0 4px 20px rgba(0,0,0,0.1)',
-        'border': '1px solid #e9ecef'
-    }),
-
-    # Data Upload Section
-    html.Div([
+        ], style={
+            'backgroundColor': 'white',
+            'padding': '30px',
+            'margin': '20px',
+            'borderRadius': '15px',
+            'boxShadow': '0 4px 20px rgba(0,0,0,0.1)',
+            'border': '1px solid #e9ecef'
+        }),
+
+        # Data Upload Section
         html.Div([
-            html.H2("📁 Data Management", className='section-title',
-                    style={'fontSize': '2.5em', 'fontWeight': '300', 'display': 'inline-block'}),
-            html.Button([
-                html.I(className="fas fa-question-circle", style={'marginRight': '5px'}),
-                "Help"
-            ], id='data-help-btn', 
-               style={
-                   'backgroundColor': '#17a2b8', 'color': 'white', 'border': 'none',
-                   'padding': '8px 15px', 'borderRadius': '20px', 'cursor': 'pointer',
-                   'fontSize': '0.9em', 'fontWeight': '500', 'marginLeft': '20px',
-                   'boxShadow': '0 2px 10px rgba(23,162,184,0.3)'
-               })
-        ], style={'textAlign': 'center', 'marginBottom': '30px'}),
+            html.Div([
+                html.H2("📁 Data Management", className='section-title',
+                        style={'fontSize': '2.5em', 'fontWeight': '300', 'display': 'inline-block'}),
+                html.Button([
+                    html.I(className="fas fa-question-circle", style={'marginRight': '5px'}),
+                    "Help"
+                ], id='data-help-btn', 
+                   style={
+                       'backgroundColor': '#17a2b8', 'color': 'white', 'border': 'none',
+                       'padding': '8px 15px', 'borderRadius': '20px', 'cursor': 'pointer',
+                       'fontSize': '0.9em', 'fontWeight': '500', 'marginLeft': '20px',
+                       'boxShadow': '0 2px 10px rgba(23,162,184,0.3)'
+                   })
+            ], style={'textAlign': 'center', 'marginBottom': '30px'}),
         
-        # Help Modal
-        html.Div([
+            # Help Modal
             html.Div([
                 html.Div([
-                    html.Span("×", className="modal-close", id="modal-close-btn", style={
-                        'position': 'absolute',
-                        'top': '15px',
-                        'right': '20px',
-                        'fontSize': '28px',
-                        'fontWeight': 'bold',
-                        'cursor': 'pointer',
-                        'color': '#aaa'
-                    }),
-                    html.H3("📊 Data Upload Guide", style={'color': '#2c3e50', 'marginBottom': '20px'}),
                     html.Div([
-                        html.H4("📸 Instagram Data Format:", style={'color': '#E4405F', 'marginBottom': '10px'}),
-                        html.P("Required columns: influencer_id, likes, comments, saves, reach, impressions, profile_visits, website_clicks, story_impressions, story_exits, story_completion_rate"),
-                        html.A("📥 Download Sample Instagram CSV", id="download-instagram-sample", 
-                               style={'color': '#E4405F', 'textDecoration': 'underline', 'cursor': 'pointer'}),
+                        html.Span("×", className="modal-close", id="modal-close-btn", style={
+                            'position': 'absolute',
+                            'top': '15px',
+                            'right': '20px',
+                            'fontSize': '28px',
+                            'fontWeight': 'bold',
+                            'cursor': 'pointer',
+                            'color': '#aaa'
+                        }),
+                        html.H3("📊 Data Upload Guide", style={'color': '#2c3e50', 'marginBottom': '20px'}),
+                        html.Div([
+                            html.H4("📸 Instagram Data Format:", style={'color': '#E4405F', 'marginBottom': '10px'}),
+                            html.P("Required columns: influencer_id, likes, comments, saves, reach, impressions, profile_visits, website_clicks, story_impressions, story_exits, story_completion_rate"),
+                            html.A("📥 Download Sample Instagram CSV", id="download-instagram-sample", 
+                                   style={'color': '#E4405F', 'textDecoration': 'underline', 'cursor': 'pointer'}),
                         
-                        html.Hr(),
+                            html.Hr(),
                         
-                        html.H4("📺 YouTube Data Format:", style={'color': '#FF0000', 'marginBottom': '10px'}),
-                        html.P("Required columns: influencer_id, impressions_ctr_percentage, audience_retention_percentage, subscribers_gained, watch_time_hours"),
-                        html.A("📥 Download Sample YouTube CSV", id="download-youtube-sample",
-                               style={'color': '#FF0000', 'textDecoration': 'underline', 'cursor': 'pointer'}),
+                            html.H4("📺 YouTube Data Format:", style={'color': '#FF0000', 'marginBottom': '10px'}),
+                            html.P("Required columns: influencer_id, impressions_ctr_percentage, audience_retention_percentage, subscribers_gained, watch_time_hours"),
+                            html.A("📥 Download Sample YouTube CSV", id="download-youtube-sample",
+                                   style={'color': '#FF0000', 'textDecoration': 'underline', 'cursor': 'pointer'}),
                         
-                        html.Hr(),
+                            html.Hr(),
                         
-                        html.H4("💰 Payout Data Format:", style={'color': '#28a745', 'marginBottom': '10px'}),
-                        html.P("Required columns: influencer_id, orders, total_revenue, total_cost"),
-                        html.P("Note: Data will be aggregated for existing influencers only.", style={'fontStyle': 'italic', 'color': '#6c757d'}),
-                        html.A("📥 Download Sample Payout CSV", 
-                               href="/assets/sample_new_payouts.csv", download="sample_payout_data.csv",
-                               style={'color': '#28a745', 'textDecoration': 'underline'}),
+                            html.H4("💰 Payout Data Format:", style={'color': '#28a745', 'marginBottom': '10px'}),
+                            html.P("Required columns: influencer_id, orders, total_revenue, total_cost"),
+                            html.P("Note: Data will be aggregated for existing influencers only.", style={'fontStyle': 'italic', 'color': '#6c757d'}),
+                            html.A("📥 Download Sample Payout CSV", 
+                                   href="/assets/sample_new_payouts.csv", download="sample_payout_data.csv",
+                                   style={'color': '#28a745', 'textDecoration': 'underline'}),
                         
-                        html.Hr(),
+                            html.Hr(),
                         
-                        html.H4("⚠️ Important Notes:", style={'color': '#dc3545', 'marginBottom': '10px'}),
-                        html.Ul([
-                            html.Li("Only existing influencer IDs are accepted"),
-                            html.Li("Files must be in CSV format"),
-                            html.Li("All required columns must be present"),
-                            html.Li("Data will be validated before upload")
+                            html.H4("⚠️ Important Notes:", style={'color': '#dc3545', 'marginBottom': '10px'}),
+                            html.Ul([
+                                html.Li("Only existing influencer IDs are accepted"),
+                                html.Li("Files must be in CSV format"),
+                                html.Li("All required columns must be present"),
+                                html.Li("Data will be validated before upload")
+                            ])
                         ])
-                    ])
-                ], style={
-                    'backgroundColor': 'white',
-                    'padding': '30px',
-                    'borderRadius': '10px',
-                    'maxWidth': '600px',
-                    'margin': '50px auto',
-                    'position': 'relative',
-                    'boxShadow': '0 10px 30px rgba(0,0,0,0.3)'
+                    ], style={
+                        'backgroundColor': 'white',
+                        'padding': '30px',
+                        'borderRadius': '10px',
+                        'maxWidth': '600px',
+                        'margin': '50px auto',
+                        'position': 'relative',
+                        'boxShadow': '0 10px 30px rgba(0,0,0,0.3)'
+                    })
+                ], id='help-modal', style={
+                    'position': 'fixed',
+                    'top': '0',
+                    'left': '0',
+                    'width': '100%',
+                    'height': '100%',
+                    'backgroundColor': 'rgba(0,0,0,0.5)',
+                    'zIndex': '1000',
+                    'display': 'none'
                 })
-            ], id='help-modal', style={
-                'position': 'fixed',
-                'top': '0',
-                'left': '0',
-                'width': '100%',
-                'height': '100%',
-                'backgroundColor': 'rgba(0,0,0,0.5)',
-                'zIndex': '1000',
-                'display': 'none'
-            })
-        ]),
+            ]),
         
-        html.Div([
-            # Instagram Upload
             html.Div([
-                html.H4("📸 Upload Instagram Data", style={'color': '#E4405F', 'marginBottom': '15px'}),
-                dcc.Upload(
-                    id='upload-instagram',
-                    children=html.Div([
-                        'Drag and Drop or ',
-                        html.A('Select Instagram CSV File')
-                    ]),
-                    style={
-                        'width': '100%',
-                        'height': '80px',
-                        'lineHeight': '80px',
-                        'borderWidth': '2px',
-                        'borderStyle': 'dashed',
-                        'borderRadius': '10px',
-                        'textAlign': 'center',
-                        'borderColor': '#E4405F',
-                        'backgroundColor': '#fef7f7'
-                    },
-                    multiple=False
-                ),
-                html.Div(id='instagram-upload-status', style={'marginTop': '10px'})
-            ], style={'width': '48%', 'display': 'inline-block'}),
+                # Instagram Upload
+                html.Div([
+                    html.H4("📸 Upload Instagram Data", style={'color': '#E4405F', 'marginBottom': '15px'}),
+                    dcc.Upload(
+                        id='upload-instagram',
+                        children=html.Div([
+                            'Drag and Drop or ',
+                            html.A('Select Instagram CSV File')
+                        ]),
+                        style={
+                            'width': '100%',
+                            'height': '80px',
+                            'lineHeight': '80px',
+                            'borderWidth': '2px',
+                            'borderStyle': 'dashed',
+                            'borderRadius': '10px',
+                            'textAlign': 'center',
+                            'borderColor': '#E4405F',
+                            'backgroundColor': '#fef7f7'
+                        },
+                        multiple=False
+                    ),
+                    html.Div(id='instagram-upload-status', style={'marginTop': '10px'})
+                ], style={'width': '48%', 'display': 'inline-block'}),
 
-            # YouTube Upload  
+                # YouTube Upload  
+                html.Div([
+                    html.H4("📺 Upload YouTube Data", style={'color': '#FF0000', 'marginBottom': '15px'}),
+                    dcc.Upload(
+                        id='upload-youtube',
+                        children=html.Div([
+                            'Drag and Drop or ',
+                            html.A('Select YouTube CSV File')
+                        ]),
+                        style={
+                            'width': '100%',
+                            'height': '80px',
+                            'lineHeight': '80px',
+                            'borderWidth': '2px',
+                            'borderStyle': 'dashed',
+                            'borderRadius': '10px',
+                            'textAlign': 'center',
+                            'borderColor': '#FF0000',
+                            'backgroundColor': '#fff5f5'
+                        },
+                        multiple=False
+                    ),
+                    html.Div(id='youtube-upload-status', style={'marginTop': '10px'})
+                ], style={'width': '48%', 'display': 'inline-block', 'marginLeft': '4%'})
+            ], style={'marginBottom': '30px'}),
+
+            # Payouts Upload
             html.Div([
-                html.H4("📺 Upload YouTube Data", style={'color': '#FF0000', 'marginBottom': '15px'}),
+                html.H4("💰 Upload Payout Data", style={'color': '#27ae60', 'marginBottom': '15px', 'textAlign': 'center'}),
                 dcc.Upload(
-                    id='upload-youtube',
+                    id='upload-payouts',
                     children=html.Div([
                         'Drag and Drop or ',
-                        html.A('Select YouTube CSV File')
+                        html.A('Select Payout CSV File')
                     ]),
                     style={
-                        'width': '100%',
+                        'width': '60%',
                         'height': '80px',
                         'lineHeight': '80px',
                         'borderWidth': '2px',
                         'borderStyle': 'dashed',
                         'borderRadius': '10px',
                         'textAlign': 'center',
-                        'borderColor': '#FF0000',
-                        'backgroundColor': '#fff5f5'
+                        'borderColor': '#27ae60',
+                        'backgroundColor': '#d5f4e6',
+                        'margin': '0 auto'
                     },
                     multiple=False
                 ),
-                html.Div(id='youtube-upload-status', style={'marginTop': '10px'})
-            ], style={'width': '48%', 'display': 'inline-block', 'marginLeft': '4%'})
-        ], style={'marginBottom': '30px'}),
+                html.Div(id='payout-upload-status', style={'marginTop': '10px', 'textAlign': 'center'})
+            ])
+        ], className='section-container'),
 
-        # Payouts Upload
-        html.Div([
-            html.H4("💰 Upload Payout Data", style={'color': '#27ae60', 'marginBottom': '15px', 'textAlign': 'center'}),
-            dcc.Upload(
-                id='upload-payouts',
-                children=html.Div([
-                    'Drag and Drop or ',
-                    html.A('Select Payout CSV File')
-                ]),
-                style={
-                    'width': '60%',
-                    'height': '80px',
-                    'lineHeight': '80px',
-                    'borderWidth': '2px',
-                    'borderStyle': 'dashed',
-                    'borderRadius': '10px',
-                    'textAlign': 'center',
-                    'borderColor': '#27ae60',
-                    'backgroundColor': '#d5f4e6',
-                    'margin': '0 auto'
-                },
-                multiple=False
-            ),
-            html.Div(id='payout-upload-status', style={'marginTop': '10px', 'textAlign': 'center'})
-        ])
-    ], className='section-container'),
+        # Hidden download components
+        dcc.Download(id="download-pdf"),
+        dcc.Download(id="download-csv-data"),
+        dcc.Download(id="download-insights-summary"),
+        dcc.Download(id="download-instagram-sample-file"),
+        dcc.Download(id="download-youtube-sample-file")
 
-    # Hidden download components
-    dcc.Download(id="download-pdf"),
-    dcc.Download(id="download-csv-data"),
-    dcc.Download(id="download-insights-summary"),
-    dcc.Download(id="download-instagram-sample-file"),
-    dcc.Download(id="download-youtube-sample-file")
+        ], className='dashboard-container')
+    ])
 
-    ], className='dashboard-container')
-])
+app.layout = serve_layout
 
-# Callback for top products display
-@app.callback(Output('top-products-display', 'children'), [Input('top-products-display', 'id')])
+# Top products display (page-load overview)
+@memoize(store, datasets=('posts',))
 def update_top_products(_):
     try:
-        # Calculate engagement metrics for each brand from posts
-        products_performance = posts_df.groupby('brand_mentioned').agg({
-            'likes': 'sum',
-            'comments': 'sum', 
-            'shares': 'sum',
-            'reach': 'sum',
-            'video_views': 'sum'
-        }).reset_index()
-        
-        # Calculate total engagement score
-        products_performance['engagement_score'] = (
-            products_performance['likes'] + 
-            products_performance['comments'] * 3 + 
-            products_performance['shares'] * 5 +
-            products_performance['video_views'] * 0.5
-        )
-        
-        # Sort by engagement score and get top 3
-        top_products = products_performance.nlargest(3, 'engagement_score')
+        # Brands ranked by engagement score - get top 3
+        top_products = views.get('top_products').head(3)
         
         # Create product chips in reverse pyramid layout
         product_chips = []
@@ -950,75 +1049,70 @@ def update_top_products(_):
         
         return html.Div([first_row, second_row])
 
-# Callback for platform chart
-@app.callback(Output('platform-chart', 'figure'), [Input('platform-chart', 'id')])
-def update_platform_chart(_):
-    platform_stats = influencer_df.groupby('platform').agg({
-        'follower_count': 'sum',
-        'influencer_id': 'count'
-    }).reset_index()
-    platform_stats.columns = ['Platform', 'Total Followers', 'Influencer Count']
+def figure_view(build):
+    """
+    View builder keeping build(registry)'s figure as decoded figure JSON: the
+    figure is constructed, validated and encoded once per data version, and
+    callbacks return the plain dict as is (do not mutate it)
+    """
+    return lambda registry: json.loads(build(registry).to_json())
+
+def build_platform_chart(registry):
+    platform_stats = registry.get('platform_stats').set_axis(
+        ['Platform', 'Total Followers', 'Influencer Count'], axis=1)
 
     fig = px.pie(platform_stats, values='Total Followers', names='Platform', 
                 title='Follower Distribution by Platform')
     fig.update_layout(title_x=0.5)
     return fig
 
-# Callback for category chart
-@app.callback(Output('category-chart', 'figure'), [Input('category-chart', 'id')])
-def update_category_chart(_):
-    category_stats = influencer_df.groupby('category').agg({
-        'follower_count': 'sum',
-        'influencer_id': 'count'
-    }).reset_index()
-    category_stats.columns = ['Category', 'Total Followers', 'Influencer Count']
+def build_category_chart(registry):
+    category_stats = registry.get('category_stats').set_axis(
+        ['Category', 'Total Followers', 'Influencer Count'], axis=1)
 
     fig = px.bar(category_stats, x='Category', y='Total Followers', 
                 title='Follower Distribution by Category')
     fig.update_layout(title_x=0.5, xaxis_tickangle=-45)
     return fig
 
-# Callback for top performers table
-@app.callback(Output('top-performers-table', 'data'), [Input('top-performers-table', 'id')])
-def update_top_performers(_):
-    # Merge payout and influencer data
-    merged_df = pd.merge(payout_df, influencer_df, on='influencer_id')
-    merged_df['roas'] = merged_df['total_revenue'] / merged_df['total_cost']
+views.register('platform_figure', ('influencers',), figure_view(build_platform_chart))
+views.register('category_figure', ('influencers',), figure_view(build_category_chart))
+
+# Platform chart (page-load overview)
+def update_platform_chart(_):
+    return views.get('platform_figure')
 
-    # Get top 10 performers by ROAS
-    top_performers = merged_df.nlargest(10, 'roas')[['name', 'category', 'platform', 'orders', 'total_revenue', 'roas']]
+# Category chart (page-load overview)
+def update_category_chart(_):
+    return views.get('category_figure')
 
-    return top_performers.to_dict('records')
+# Influencers ranked by ROAS, served a page at a time to the top performers table
+@memoize(store, datasets=('payouts', 'influencers'))
+def performer_table():
+    return SortedTable(views.get('performer_ranking')[['name', 'category', 'platform', 'orders', 'total_revenue', 'roas']])
 
-# Callback for Campaign Performance KPI Cards
+# Callback for top performers table (server-side paging, sorting and filtering)
 @app.callback(
-    Output('campaign-kpi-cards', 'children'),
-    [Input('platform-chart', 'id')]
+    [Output('top-performers-table', 'data'),
+     Output('top-performers-table', 'page_count')],
+    [Input('top-performers-table', 'page_current'),
+     Input('top-performers-table', 'page_size'),
+     Input('top-performers-table', 'sort_by'),
+     Input('top-performers-table', 'filter_query')]
 )
+def update_top_performers(page_current, page_size, sort_by, filter_query):
+    # Best ROAS first unless the user sorts on a column
+    return performer_table().page(page_current, page_size, sort_by, filter_query)
+
+# Campaign Performance KPI Cards (page-load overview)
+@memoize(store, datasets=('payouts', 'influencers', 'brand_performance', 'posts'))
 def update_campaign_kpis(_):
-    # Calculate campaign metrics
-    total_campaigns = len(payout_df)
-    avg_campaign_roas = (payout_df['total_revenue'] / payout_df['total_cost']).mean()
-    total_influencers = len(influencer_df)
-    avg_orders_per_campaign = payout_df['orders'].mean()
-    
-    # Calculate brands performance from brand_performance CSV or posts data
-    try:
-        brand_performance_df = pd.read_csv('data/brand_performance.csv')
-        best_brand = brand_performance_df.loc[brand_performance_df['total_revenue'].idxmax()]
-        best_brand = {'brand': best_brand['brand'], 'revenue': best_brand['total_revenue']}
-    except:
-        posts_df = pd.read_csv('data/posts.csv')
-        brand_performance = posts_df.groupby('brand_mentioned').agg({
-            'post_id': 'count',
-            'reach': 'sum'
-        }).reset_index()
-        brand_performance.columns = ['brand', 'campaigns', 'reach']
-        
-        # Calculate revenue estimate based on reach (static conversion rate)
-        brand_performance['revenue'] = brand_performance['reach'] * 0.05  # 5% conversion estimate
-        
-        best_brand = brand_performance.loc[brand_performance['revenue'].idxmax()]
+    # Campaign metrics, including the best brand from brand_performance CSV or posts data
+    campaign_kpis = views.get('campaign_kpis')
+    total_campaigns = campaign_kpis['total_campaigns']
+    avg_campaign_roas = campaign_kpis['avg_campaign_roas']
+    total_influencers = campaign_kpis['total_influencers']
+    best_brand = campaign_kpis['best_brand']
     
     return html.Div([
         # First Row - 2 cards
@@ -1077,30 +1171,9 @@ def update_campaign_kpis(_):
         ], className='card-row')
     ])
 
-# Callback for Brand Performance Chart
-@app.callback(Output('brand-performance-chart', 'figure'), [Input('brand-performance-chart', 'id')])
-def update_brand_performance_chart(_):
-    # Load brand performance data from CSV
-    try:
-        brand_df = pd.read_csv('data/brand_performance.csv')
-        brand_df.columns = ['Brand', 'Campaigns', 'Reach', 'Revenue', 'Cost', 'ROAS']
-    except:
-        # Fallback: Create brand performance data from posts
-        posts_df = pd.read_csv('data/posts.csv')
-        brand_performance = posts_df.groupby('brand_mentioned').agg({
-            'post_id': 'count',
-            'reach': 'sum',
-            'likes': 'sum'
-        }).reset_index()
-        
-        # Calculate revenue estimate and ROAS
-        brand_performance['revenue'] = brand_performance['reach'] * 0.05  # 5% conversion
-        brand_performance['cost'] = brand_performance['post_id'] * 50000  # ₹50k per campaign
-        brand_performance['roas'] = brand_performance['revenue'] / brand_performance['cost']
-        
-        # Rename columns for chart
-        brand_performance.columns = ['Brand', 'Campaigns', 'Reach', 'Likes', 'Revenue', 'Cost', 'ROAS']
-        brand_df = brand_performance.sort_values('Revenue', ascending=False)
+def build_brand_performance_chart(registry):
+    # Brand performance from CSV, falling back to estimates from posts
+    brand_df = registry.get('brand_performance')
     
     # Use go.Figure instead of px.bar to avoid template issues
     fig = go.Figure()
@@ -1121,10 +1194,16 @@ def update_brand_performance_chart(_):
     )
     return fig
 
+views.register('brand_performance_figure', ('brand_performance', 'posts'),
+               figure_view(build_brand_performance_chart))
+
+# Brand Performance Chart (page-load overview)
+def update_brand_performance_chart(_):
+    return views.get('brand_performance_figure')
+
 
     # Create timeline data based on posts data
-    posts_df = pd.read_csv('data/posts.csv')
-    posts_df['date'] = pd.to_datetime(posts_df['date'])
+    posts_df = store.get('posts')
     
     # Group by date and calculate metrics
     daily_metrics = posts_df.groupby('date').agg({
@@ -1170,12 +1249,10 @@ def update_brand_performance_chart(_):
     
     return fig
 
-# Callback for Payout Summary Cards
-@app.callback(
-    Output('payout-summary-cards', 'children'),
-    [Input('payout-tracking-table', 'id')]
-)
+# Payout Summary Cards (page-load overview)
+@memoize(store, datasets=('payouts',))
 def update_payout_summary(_):
+    payout_df = store.get('payouts')
     # Calculate payout metrics
     total_payouts = payout_df['total_cost'].sum()
     pending_amount = total_payouts * 0.15  # 15% pending
@@ -1242,19 +1319,18 @@ def update_payout_summary(_):
         ], className='card-row')
     ])
 
-# Callback for Payout Tracking Table
-@app.callback(Output('payout-tracking-table', 'data'), [Input('payout-tracking-table', 'id')])
-def update_payout_tracking_table(_):
-    # Merge payout and influencer data with posts data to get brands
-    merged_df = pd.merge(payout_df, influencer_df, on='influencer_id')
-    posts_df = pd.read_csv('data/posts.csv')
+# Payout ledger behind the payout tracking table, served a page at a time
+@memoize(store, datasets=('payouts', 'influencers', 'posts'), ttl=DATE_DEPENDENT_TTL)
+def payout_ledger():
+    # Payouts joined with influencer details (shared view), plus brands from posts
+    merged_df = views.get('payout_overview')[
+        ['influencer_id', 'name', 'platform', 'basis', 'orders', 'payout_amount', 'total_cost']].copy()
+    posts_df = store.get('posts')
     
     # Get brand for each influencer from their most recent post
-    influencer_brands = posts_df.groupby('influencer_id')['brand_mentioned'].first().reset_index()
-    influencer_brands.columns = ['influencer_id', 'brand']
-    
-    merged_df = pd.merge(merged_df, influencer_brands, on='influencer_id', how='left')
-    merged_df['brand'] = merged_df['brand'].fillna('HealthKart')  # Default brand
+    influencer_brands = posts_df.groupby(posts_df['influencer_id'].astype(object))['brand_mentioned'].first()
+    merged_df['brand'] = merged_df['influencer_id'].astype(object).map(influencer_brands)
+    merged_df['brand'] = merged_df['brand'].astype(object).fillna('HealthKart')  # Default brand
     
     # Set payment type based on basis column
     merged_df['payment_type'] = merged_df['basis'].apply(
@@ -1278,31 +1354,46 @@ def update_payout_tracking_table(_):
     payout_table = merged_df[['name', 'brand', 'platform', 'payment_type', 'orders', 'payout_amount', 'status', 'payout_date']].copy()
     payout_table.columns = ['influencer_name', 'brand', 'platform', 'payment_type', 'orders', 'payout_amount', 'status', 'payout_date']
     
-    return payout_table.to_dict('records')
+    return SortedTable(payout_table)
+
+# Callback for Payout Tracking Table (server-side paging, sorting and filtering)
+@app.callback(
+    [Output('payout-tracking-table', 'data'),
+     Output('payout-tracking-table', 'page_count')],
+    [Input('payout-tracking-table', 'page_current'),
+     Input('payout-tracking-table', 'page_size'),
+     Input('payout-tracking-table', 'sort_by'),
+     Input('payout-tracking-table', 'filter_query')]
+)
+def update_payout_tracking_table(page_current, page_size, sort_by, filter_query):
+    return payout_ledger().page(page_current, page_size, sort_by, filter_query)
 
 # Callback for influencer-specific KPIs
 @app.callback(
     Output('platform-kpis-container', 'children'),
     [Input('influencer-dropdown', 'value')]
 )
+@memoize(store, datasets=('influencers', 'tracking'), maxsize=256)
 def update_influencer_kpis(selected_influencer):
     # Get influencer info
-    influencer_info = influencer_df[influencer_df['influencer_id'] == selected_influencer].iloc[0]
+    influencer_info = backend.select('influencers', {'influencer_id': selected_influencer}).iloc[0]
     
-    # Get tracking data for this influencer
-    influencer_tracking = tracking_df[tracking_df['influencer_id'] == selected_influencer]
+    # Tracking totals and top products for this influencer: precomputed per
+    # influencer in memory, or aggregated from an indexed query under SQLite
+    if QUERY_BACKEND == 'sqlite':
+        summary = summarize_tracking(backend.select('tracking', {'influencer_id': selected_influencer},
+                                                    columns=['orders', 'revenue', 'user_id', 'product']))
+    else:
+        summary = views.get('influencer_partitions').summary(selected_influencer)
     
     # Calculate metrics
-    total_orders = influencer_tracking['orders'].sum()
-    total_revenue = influencer_tracking['revenue'].sum()
+    total_orders = summary['total_orders']
+    total_revenue = summary['total_revenue']
     avg_order_value = total_revenue / total_orders if total_orders > 0 else 0
-    unique_customers = influencer_tracking['user_id'].nunique()
+    unique_customers = summary['unique_customers']
     
     # Product performance
-    top_products = influencer_tracking.groupby('product').agg({
-        'orders': 'sum',
-        'revenue': 'sum'
-    }).sort_values('revenue', ascending=False).head(3)
+    top_products = summary['top_products']
     
     return html.Div([
         # Influencer Header
@@ -1390,29 +1481,29 @@ def update_influencer_kpis(selected_influencer):
         ])
     ])
 
-# Callback for Instagram KPIs
-@app.callback(
-    Output('instagram-kpis-cards', 'children'),
-    [Input('platform-chart', 'id')]
-)
+# Instagram KPIs (page-load overview)
+@memoize(store, datasets=('instagram',))
 def update_instagram_kpis(_):
+    # Running totals are kept current by uploads without a full recompute
+    instagram_totals = views.get('instagram_totals')
+    
     # Calculate engagement rate
-    total_likes = instagram_df['likes'].sum()
-    total_comments = instagram_df['comments'].sum()
-    total_saves = instagram_df['saves'].sum()
-    total_reach = instagram_df['reach'].sum()
+    total_likes = instagram_totals.sum('likes')
+    total_comments = instagram_totals.sum('comments')
+    total_saves = instagram_totals.sum('saves')
+    total_reach = instagram_totals.sum('reach')
     engagement_rate = (total_likes + total_comments + total_saves) / total_reach * 100
     
     # Story completion rate
-    story_completion = instagram_df['story_completion_rate'].mean()
+    story_completion = instagram_totals.mean('story_completion_rate')
     
     # Profile Visits + Website Clicks
-    total_visits = instagram_df['profile_visits'].sum()
-    total_clicks = instagram_df['website_clicks'].sum()
+    total_visits = instagram_totals.sum('profile_visits')
+    total_clicks = instagram_totals.sum('website_clicks')
     profile_activity = (total_visits + total_clicks) / total_reach * 100
     
     # Average impressions
-    avg_impressions = instagram_df['impressions'].mean()
+    avg_impressions = instagram_totals.mean('impressions')
 
     return html.Div([
         # Engagement Rate Card
@@ -1467,23 +1558,23 @@ def update_instagram_kpis(_):
         })
     ])
 
-# Callback for YouTube KPIs
-@app.callback(
-    Output('youtube-kpis-cards', 'children'),
-    [Input('platform-chart', 'id')]
-)
+# YouTube KPIs (page-load overview)
+@memoize(store, datasets=('youtube',))
 def update_youtube_kpis(_):
+    # Running totals are kept current by uploads without a full recompute
+    youtube_totals = views.get('youtube_totals')
+    
     # Calculate average CTR
-    avg_ctr = youtube_df['impressions_ctr_percentage'].mean()
+    avg_ctr = youtube_totals.mean('impressions_ctr_percentage')
     
     # Calculate average retention
-    avg_retention = youtube_df['audience_retention_percentage'].mean()
+    avg_retention = youtube_totals.mean('audience_retention_percentage')
     
     # Total subscribers gained
-    total_subs_gained = youtube_df['subscribers_gained'].sum()
+    total_subs_gained = youtube_totals.sum('subscribers_gained')
     
     # Average watch time
-    avg_watch_time = youtube_df['watch_time_hours'].mean()
+    avg_watch_time = youtube_totals.mean('watch_time_hours')
     
     return html.Div([
         # CTR Card
@@ -1538,48 +1629,84 @@ def update_youtube_kpis(_):
         })
     ])
 
+# Every page-load panel above is filled by this one callback, so a page load
+# is a single request (plus one per paged table, which request their own
+# pages). The panels read the shared views (the payouts x influencers merge
+# happens once, in payout_overview) and each is memoized on the datasets it
+# reads, so an upload only recomputes the panels it affects. A panel whose
+# builder fails keeps its current content; the other panels still update.
+OVERVIEW_PANELS = (
+    update_top_products,
+    update_platform_chart,
+    update_category_chart,
+    update_campaign_kpis,
+    update_brand_performance_chart,
+    update_payout_summary,
+    update_instagram_kpis,
+    update_youtube_kpis,
+)
+
+@app.callback(
+    [Output('top-products-display', 'children'),
+     Output('platform-chart', 'figure'),
+     Output('category-chart', 'figure'),
+     Output('campaign-kpi-cards', 'children'),
+     Output('brand-performance-chart', 'figure'),
+     Output('payout-summary-cards', 'children'),
+     Output('instagram-kpis-cards', 'children'),
+     Output('youtube-kpis-cards', 'children')],
+    [Input('platform-chart', 'id')]
+)
+def update_overview(_):
+    panels = []
+    for build_panel in OVERVIEW_PANELS:
+        try:
+            panels.append(build_panel(_))
+        except Exception as e:
+            print(f"Error building overview panel {build_panel.__name__}: {e}")
+            panels.append(dash.no_update)
+    return tuple(panels)
+
 
 # ---------- HELPER FUNCTIONS FOR ADVANCED ANALYTICS ----------
 
-def calc_audience_growth(df_inf, df_posts=None):
+def calc_audience_growth(df_inf, df_posts=None, weeks=12):
     """
     Module 1: Audience Growth Analytics
-    Calculate net-new followers and follower CAGR
+    Calculate net-new followers and follower CAGR over the last `weeks` weeks,
+    computed on an influencers x weeks grid
     """
     if df_inf.empty:
         return pd.DataFrame()
     
-    growth_data = []
-    for _, influencer in df_inf.iterrows():
-        base_followers = influencer['follower_count']
-        # Create static growth data based on influencer characteristics
-        for week in range(12):
-            date = datetime.now() - timedelta(weeks=week)
-            # Use a static growth rate based on follower count (bigger influencers = more stable)
-            if base_followers > 5000000:
-                growth_rate = 1.02  # 2% growth for mega influencers
-            elif base_followers > 1000000:
-                growth_rate = 1.03  # 3% growth for macro influencers  
-            else:
-                growth_rate = 1.05  # 5% growth for micro influencers
-                
-            followers = int(base_followers * (growth_rate ** (12-week)))
-            net_new = max(int(followers * 0.02), 100)  # 2% new followers per week, minimum 100
-            
-            growth_data.append({
-                'influencer_id': influencer['influencer_id'],
-                'name': influencer['name'],
-                'date': date.strftime('%Y-%m-%d'),
-                'week': week,
-                'followers': followers,
-                'net_new': net_new,
-                'platform': influencer['platform']
-            })
-    
-    growth_df = pd.DataFrame(growth_data)
-    growth_df['follower_cagr'] = growth_df.groupby('influencer_id')['followers'].pct_change().fillna(0) * 100
-    
-    return growth_df
+    base_followers = df_inf['follower_count'].to_numpy(dtype=float)[:, None]
+    week = np.arange(weeks)
+    now = datetime.now()
+    dates = np.array([(now - timedelta(weeks=int(w))).strftime('%Y-%m-%d') for w in week], dtype=object)
+    
+    # Use a static growth rate based on follower count (bigger influencers = more stable):
+    # 2% for mega, 3% for macro and 5% for micro influencers
+    growth_rate = np.select([base_followers > 5000000, base_followers > 1000000], [1.02, 1.03], 1.05)
+    followers = (base_followers * (growth_rate ** (weeks - week))).astype(np.int64)
+    net_new = np.maximum((followers * 0.02).astype(np.int64), 100)  # 2% new followers per week, minimum 100
+    
+    # Week-over-week change within each influencer's row of the grid (0 for week 0)
+    follower_cagr = np.zeros(followers.shape)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        follower_cagr[:, 1:] = followers[:, 1:] / followers[:, :-1] - 1
+    follower_cagr = np.where(np.isnan(follower_cagr), 0, follower_cagr) * 100
+    
+    n = len(df_inf)
+    return pd.DataFrame({
+        'influencer_id': np.repeat(df_inf['influencer_id'].astype(object).to_numpy(), weeks),
+        'name': np.repeat(df_inf['name'].astype(object).to_numpy(), weeks),
+        'date': np.tile(dates, n),
+        'week': np.tile(week, n),
+        'followers': followers.ravel(),
+        'net_new': net_new.ravel(),
+        'platform': np.repeat(df_inf['platform'].astype(object).to_numpy(), weeks),
+        'follower_cagr': follower_cagr.ravel(),
+    })
 
 def calc_incremental_roas(df_payout, baseline_rate=0.30):
     """
@@ -1605,64 +1732,59 @@ def calc_incremental_roas(df_payout, baseline_rate=0.30):
     
     return df
 
-def calc_creative_fatigue(df_posts, df_instagram=None):
+def calc_creative_fatigue(df_posts, df_instagram=None, weeks=4):
     """
     Module 3: Creative Fatigue Analytics
-    Calculate %Δ CTR and %Δ CPC by flight week
+    Calculate %Δ CTR and %Δ CPC by flight week, computed on a posts x weeks grid
     """
     if df_posts.empty:
         return pd.DataFrame()
     
-    fatigue_data = []
-    
-    for _, post in df_posts.iterrows():
-        # Generate static performance data based on post characteristics
-        for week in range(1, 5):
-            decay_factor = 1 - (0.15 * (week - 1))  # 15% decay per week
-            
-            # Base CTR/CPC based on platform and engagement
-            if post['platform'] == 'Instagram':
-                base_ctr = 2.5 + (post['likes'] / post['reach']) * 100 if post['reach'] > 0 else 2.5
-                base_cpc = 35
-            else:  # YouTube
-                base_ctr = 3.2 + (post['likes'] / post['video_views']) * 100 if post['video_views'] > 0 else 3.2
-                base_cpc = 28
-            
-            ctr = base_ctr * decay_factor
-            cpc = base_cpc / decay_factor
-            
-            fatigue_data.append({
-                'post_id': post['post_id'],
-                'influencer_id': post['influencer_id'],
-                'week': week,
-                'ctr': ctr,
-                'cpc': cpc,
-                'platform': post['platform']
-            })
-    
-    fatigue_df = pd.DataFrame(fatigue_data)
-    
-    # Calculate percentage changes
-    fatigue_df['ctr_pct_change'] = fatigue_df.groupby('post_id')['ctr'].pct_change() * 100
-    fatigue_df['cpc_pct_change'] = fatigue_df.groupby('post_id')['cpc'].pct_change() * 100
-    
-    return fatigue_df
-
-def calc_product_affinity(df_tracking):
+    # 15% decay per week, floored so long flights never reach zero
+    week = np.arange(1, weeks + 1)
+    decay_factor = np.maximum(1 - (0.15 * (week - 1)), 0.1)
+    
+    # Base CTR/CPC based on platform and engagement: likes per reach on
+    # Instagram, likes per video view otherwise (YouTube)
+    is_instagram = (df_posts['platform'] == 'Instagram').to_numpy()
+    likes = df_posts['likes'].to_numpy(dtype=float)
+    audience = np.where(is_instagram, df_posts['reach'].to_numpy(dtype=float),
+                        df_posts['video_views'].to_numpy(dtype=float))
+    base = np.where(is_instagram, 2.5, 3.2)
+    engagement = np.divide(likes, audience, out=np.zeros(len(df_posts)), where=audience > 0)
+    base_ctr = np.where(audience > 0, base + engagement * 100, base)
+    base_cpc = np.where(is_instagram, 35, 28)
+    
+    ctr = base_ctr[:, None] * decay_factor
+    cpc = base_cpc[:, None] / decay_factor
+    
+    # Week-over-week change along each post's row of the grid (NaN for week 1)
+    ctr_pct_change = np.full(ctr.shape, np.nan)
+    cpc_pct_change = np.full(cpc.shape, np.nan)
+    ctr_pct_change[:, 1:] = (ctr[:, 1:] / ctr[:, :-1] - 1) * 100
+    cpc_pct_change[:, 1:] = (cpc[:, 1:] / cpc[:, :-1] - 1) * 100
+    
+    n = len(df_posts)
+    return pd.DataFrame({
+        'post_id': np.repeat(df_posts['post_id'].astype(object).to_numpy(), weeks),
+        'influencer_id': np.repeat(df_posts['influencer_id'].astype(object).to_numpy(), weeks),
+        'week': np.tile(week, n),
+        'ctr': ctr.ravel(),
+        'cpc': cpc.ravel(),
+        'platform': np.repeat(df_posts['platform'].astype(object).to_numpy(), weeks),
+        'ctr_pct_change': ctr_pct_change.ravel(),
+        'cpc_pct_change': cpc_pct_change.ravel(),
+    })
+
+def calc_product_affinity(affinity):
     """
     Module 4: Product Affinity Analytics
-    Calculate SKU-level CVR, AOV, attach rate
+    Calculate SKU-level CVR, AOV, attach rate from per-product totals
+    (see tracking_product_totals)
     """
-    if df_tracking.empty:
+    if affinity.empty:
         return pd.DataFrame()
     
-    # Group by product
-    affinity = df_tracking.groupby('product').agg({
-        'orders': 'sum',
-        'revenue': 'sum',
-        'user_id': 'nunique'  # unique users per product
-    }).reset_index()
-    
     # Calculate key metrics
     affinity['aov'] = affinity['revenue'] / affinity['orders']  # Average Order Value
     affinity['cvr'] = (affinity['orders'] / affinity['user_id']) * 100  # Conversion Rate
@@ -1670,6 +1792,41 @@ def calc_product_affinity(df_tracking):
     
     return affinity
 
+# Coordinates of the Indian cities in geographic_distribution.csv; unknown
+# cities are placed at the centre of India
+CITY_GAZETTEER = pd.DataFrame([
+    ('Mumbai', 19.0760, 72.8777),
+    ('Delhi', 28.7041, 77.1025),
+    ('Bangalore', 12.9716, 77.5946),
+    ('Bengaluru', 12.9716, 77.5946),
+    ('Hyderabad', 17.3850, 78.4867),
+    ('Chennai', 13.0827, 80.2707),
+    ('Kolkata', 22.5726, 88.3639),
+    ('Pune', 18.5204, 73.8567),
+    ('Ahmedabad', 23.0225, 72.5714),
+    ('Jaipur', 26.9124, 75.7873),
+    ('Surat', 21.1702, 72.8311),
+    ('Lucknow', 26.8467, 80.9462),
+    ('Kanpur', 26.4499, 80.3319),
+    ('Nagpur', 21.1458, 79.0882),
+    ('Indore', 22.7196, 75.8577),
+    ('Thane', 19.2183, 72.9781),
+    ('Bhopal', 23.2599, 77.4126),
+    ('Visakhapatnam', 17.6868, 83.2185),
+    ('Pimpri-Chinchwad', 18.6298, 73.7997),
+    ('Patna', 25.5941, 85.1376),
+], columns=['city', 'latitude', 'longitude']).set_index('city')
+DEFAULT_COORDINATES = {'latitude': 20.5937, 'longitude': 78.9629}
+
+def stable_city_offset(cities):
+    """
+    0-99 bucket per city name used to spread overlapping markers. crc32 is the
+    same in every process, unlike the per-process salted hash().
+    """
+    names = cities.astype(str)
+    buckets = {name: zlib.crc32(name.encode('utf-8')) % 100 for name in pd.unique(names)}
+    return names.map(buckets)
+
 def calc_geo_efficiency(df_geo):
     """
     Module 5: Geo Efficiency Analytics
@@ -1680,30 +1837,6 @@ def calc_geo_efficiency(df_geo):
     
     df = df_geo.copy()
     
-    # Add latitude and longitude if not present (for Indian cities)
-    city_coordinates = {
-        'Mumbai': {'latitude': 19.0760, 'longitude': 72.8777},
-        'Delhi': {'latitude': 28.7041, 'longitude': 77.1025},
-        'Bangalore': {'latitude': 12.9716, 'longitude': 77.5946},
-        'Bengaluru': {'latitude': 12.9716, 'longitude': 77.5946},
-        'Hyderabad': {'latitude': 17.3850, 'longitude': 78.4867},
-        'Chennai': {'latitude': 13.0827, 'longitude': 80.2707},
-        'Kolkata': {'latitude': 22.5726, 'longitude': 88.3639},
-        'Pune': {'latitude': 18.5204, 'longitude': 73.8567},
-        'Ahmedabad': {'latitude': 23.0225, 'longitude': 72.5714},
-        'Jaipur': {'latitude': 26.9124, 'longitude': 75.7873},
-        'Surat': {'latitude': 21.1702, 'longitude': 72.8311},
-        'Lucknow': {'latitude': 26.8467, 'longitude': 80.9462},
-        'Kanpur': {'latitude': 26.4499, 'longitude': 80.3319},
-        'Nagpur': {'latitude': 21.1458, 'longitude': 79.0882},
-        'Indore': {'latitude': 22.7196, 'longitude': 75.8577},
-        'Thane': {'latitude': 19.2183, 'longitude': 72.9781},
-        'Bhopal': {'latitude': 23.2599, 'longitude': 77.4126},
-        'Visakhapatnam': {'latitude': 17.6868, 'longitude': 83.2185},
-        'Pimpri-Chinchwad': {'latitude': 18.6298, 'longitude': 73.7997},
-        'Patna': {'latitude': 25.5941, 'longitude': 85.1376}
-    }
-    
     # Add product information if not present
     products = ['Protein Powder', 'Multivitamins', 'Fish Oil', 'BCAA', 'Pre-Workout', 'Whey Protein', 'Creatine']
     
@@ -1721,13 +1854,14 @@ def calc_geo_efficiency(df_geo):
         # Create cycling pattern for products based on index
         df['product'] = [products[i % len(products)] for i in range(len(df))]
     
-    # Add coordinates without random offset for consistency
+    # Add coordinates from the gazetteer without random offset for consistency
     if 'latitude' not in df.columns or 'longitude' not in df.columns:
-        df['latitude'] = df['city'].map(lambda x: city_coordinates.get(x, {}).get('latitude', 20.5937))
-        df['longitude'] = df['city'].map(lambda x: city_coordinates.get(x, {}).get('longitude', 78.9629))
+        cities = df['city'].astype(object)
+        df['latitude'] = cities.map(CITY_GAZETTEER['latitude']).fillna(DEFAULT_COORDINATES['latitude'])
+        df['longitude'] = cities.map(CITY_GAZETTEER['longitude']).fillna(DEFAULT_COORDINATES['longitude'])
         
-    # Add small static offset based on city name hash to prevent overlapping markers
-    df['city_hash'] = df['city'].astype(str).apply(lambda x: abs(hash(x)) % 100)
+    # Add small static offset based on city name to prevent overlapping markers
+    df['city_hash'] = stable_city_offset(df['city'])
     df['latitude'] = df['latitude'] + (df['city_hash'] - 50) * 0.002
     df['longitude'] = df['longitude'] + (df['city_hash'] - 50) * 0.002
     
@@ -1743,30 +1877,20 @@ def calc_geo_efficiency(df_geo):
     
     return df
 
-def calc_lifetime_lift(df_tracking):
+# The enriched geo frame is built once per version of geographic_distribution
+views.register('geo_efficiency', ('geographic_distribution',),
+               lambda registry: calc_geo_efficiency(registry.store.get('geographic_distribution')))
+
+def calc_lifetime_lift(cohorts, df_payouts):
     """
     Module 6: Lifetime Lift Analytics
-    Calculate 90-day LTV vs CAC
+    Calculate 30/60/90/180-day LTV vs CAC per influencer and per acquisition
+    cohort, from each customer's first attributed order (see cohorts.CohortLTV)
     """
-    if df_tracking.empty:
-        return pd.DataFrame()
+    if not len(cohorts.users):
+        return pd.DataFrame(), pd.DataFrame()
     
-    # Convert date column to datetime
-    df_tracking['date'] = pd.to_datetime(df_tracking['date'])
-    
-    # Create cohorts based on user acquisition month
-    df_tracking['cohort_month'] = df_tracking['date'].dt.to_period('M')
-    
-    # Calculate LTV metrics
-    cohort_data = df_tracking.groupby(['cohort_month', 'influencer_id']).agg({
-        'revenue': 'sum',
-        'orders': 'sum',
-        'user_id': 'nunique'
-    }).reset_index()
-    
-    cohort_data['ltv'] = cohort_data['revenue'] / cohort_data['user_id']
-    
-    return cohort_data
+    return cohorts.by_influencer(df_payouts), cohorts.by_cohort(df_payouts)
 
 
 # ---------- ADVANCED ANALYTICS TAB CALLBACK ----------
@@ -1774,8 +1898,12 @@ def calc_lifetime_lift(df_tracking):
     Output('advanced-content', 'children'),
     Input('advanced-tabs', 'value')
 )
+@memoize(store, ttl=DATE_DEPENDENT_TTL)
 def render_advanced_content(selected_tab):
     """Main callback for advanced analytics tabs"""
+    payout_df = store.get('payouts')
+    influencer_df = store.get('influencers')
+    posts_df = store.get('posts')
     
     if selected_tab == 'audience-growth':
         # Module 1: Audience Growth
@@ -1831,7 +1959,7 @@ def render_advanced_content(selected_tab):
     
     elif selected_tab == 'product-affinity':
         # Module 4: Product Affinity
-        affinity_data = calc_product_affinity(tracking_df)
+        affinity_data = calc_product_affinity(tracking_product_totals())
         
         if affinity_data.empty:
             return html.Div([
@@ -1851,7 +1979,7 @@ def render_advanced_content(selected_tab):
     
     elif selected_tab == 'geo-efficiency':
         # Module 5: Geo Efficiency
-        geo_data = calc_geo_efficiency(geographic_distribution_df)
+        geo_data = views.get('geo_efficiency')
         
         if geo_data.empty:
             return html.Div([
@@ -1939,38 +2067,59 @@ def render_advanced_content(selected_tab):
     
     elif selected_tab == 'lifetime-lift':
         # Module 6: Lifetime Lift
-        cohort_data = calc_lifetime_lift(tracking_df)
+        ltv_by_influencer, ltv_by_cohort = calc_lifetime_lift(views.get('cohort_ltv'), payout_df)
         
-        if cohort_data.empty:
+        if ltv_by_influencer.empty:
             return html.Div([
                 html.H4("Lifetime Lift Analysis", style={'textAlign': 'center'}),
                 html.P("No tracking data available.", style={'textAlign': 'center', 'color': '#7f8c8d'})
             ])
         
-        # Create LTV by influencer chart
-        ltv_summary = cohort_data.groupby('influencer_id')['ltv'].mean().reset_index()
-        fig = px.bar(ltv_summary, x='influencer_id', y='ltv', 
-                    title='Average LTV by Influencer')
+        ltv_columns = {f'ltv_{window}': f'{window}-day LTV' for window in LTV_WINDOWS}
+        
+        # LTV by influencer, one bar per window
+        ltv_long = ltv_by_influencer.melt(id_vars='influencer_id', value_vars=list(ltv_columns),
+                                          var_name='window', value_name='ltv')
+        ltv_long['window'] = ltv_long['window'].map(ltv_columns)
+        fig = px.bar(ltv_long, x='influencer_id', y='ltv', color='window', barmode='group',
+                    title='LTV by Influencer (customers acquired)')
         fig.update_layout(height=400)
         
+        ratio_column = f'ltv_cac_{DEFAULT_LTV_WINDOW}'
+        ratio_fig = px.bar(ltv_by_influencer, x='influencer_id', y=ratio_column,
+                          title=f'{DEFAULT_LTV_WINDOW}-day LTV:CAC by Influencer',
+                          labels={ratio_column: 'LTV:CAC'})
+        ratio_fig.add_hline(y=1, line_dash='dash', line_color='#e74c3c')
+        ratio_fig.update_layout(height=400)
+        
+        # LTV curve of each acquisition cohort
+        cohort_long = ltv_by_cohort.assign(cohort_month=ltv_by_cohort['cohort_month'].astype(str)).melt(
+            id_vars='cohort_month', value_vars=list(ltv_columns), var_name='window', value_name='ltv')
+        cohort_long['window'] = cohort_long['window'].map(ltv_columns)
+        cohort_fig = px.line(cohort_long, x='window', y='ltv', color='cohort_month', markers=True,
+                            title='LTV by Acquisition Cohort')
+        cohort_fig.update_layout(height=400)
+        
         return html.Div([
             html.H4("Lifetime Lift Analysis", style={'textAlign': 'center'}),
-            dcc.Graph(figure=fig)
+            html.P("A window's LTV only counts customers whose first order is at least that many days "
+                   "before the latest tracked order.",
+                   style={'textAlign': 'center', 'color': '#7f8c8d'}),
+            dcc.Graph(figure=fig),
+            dcc.Graph(figure=ratio_fig),
+            dcc.Graph(figure=cohort_fig)
         ])
     
     elif selected_tab == 'cac-analysis':
         # CAC Analysis - prepare the data first with fallback
         try:
-            if tracking_data_df.empty:
+            uniques = tracking_unique_customers()
+            if uniques.empty:
                 cost_orders = payout_df[['influencer_id', 'total_cost', 'orders']].copy()
                 cost_orders = cost_orders.merge(influencer_df[['influencer_id', 'platform']],
                                                 on='influencer_id', how='left')
                 cost_orders['unique_customers'] = (cost_orders['orders'] * 0.8).astype(int)  # Static 80% unique rate
             else:
-                uniques = (tracking_data_df
-                           .groupby('influencer_id')['user_id']
-                           .nunique()
-                           .reset_index(name='unique_customers'))
                 cost_orders = payout_df.merge(uniques, on='influencer_id', how='left')
                 cost_orders = cost_orders.merge(influencer_df[['influencer_id', 'platform']],
                                                 on='influencer_id', how='left')
@@ -1984,7 +2133,7 @@ def render_advanced_content(selected_tab):
             avg_cac = cost_orders['cac'].mean()
 
             # Platform breakdown
-            by_platform = (cost_orders.groupby('platform')
+            by_platform = (cost_orders.groupby('platform', observed=True)
                            .agg(total_cost=('total_cost', 'sum'),
                                 customers=('unique_customers', 'sum'))
                            .reset_index())
@@ -2083,35 +2232,23 @@ def render_advanced_content(selected_tab):
 def upload_instagram_data(contents, filename):
     if contents is not None:
         try:
-            import base64
-            import io
-            
-            # Decode the uploaded file
-            content_type, content_string = contents.split(',')
-            decoded = base64.b64decode(content_string)
-            df_new = pd.read_csv(io.StringIO(decoded.decode('utf-8')))
-            
-            # Validate required columns for Instagram data
-            required_cols = ['influencer_id', 'likes', 'comments', 'saves', 'reach', 'impressions']
-            missing_cols = [col for col in required_cols if col not in df_new.columns]
-            if missing_cols:
-                return html.Div(f"❌ Missing required columns: {missing_cols}", style={'color': '#e74c3c'})
-            
-            # Check if influencers exist and are Instagram influencers
-            existing_instagram_influencers = set(influencer_df[influencer_df['platform'] == 'Instagram']['influencer_id'])
-            new_influencers = set(df_new['influencer_id'])
-            invalid_influencers = new_influencers - existing_instagram_influencers
-            
-            if invalid_influencers:
-                return html.Div(f"❌ Invalid influencer IDs for Instagram: {list(invalid_influencers)}", style={'color': '#e74c3c'})
-            
-            # Append to existing Instagram data
-            existing_df = pd.read_csv('data/instagram_insights_data.csv')
-            combined_df = pd.concat([existing_df, df_new], ignore_index=True)
-            combined_df.to_csv('data/instagram_insights_data.csv', index=False)
-            
-            return html.Div(f"✅ Successfully uploaded {len(df_new)} Instagram records!", style={'color': '#27ae60'})
-            
+            # Parse, validate (see validation.UPLOAD_SCHEMAS) and append the upload
+            # chunk by chunk, folding each chunk into the KPI totals as it goes
+            influencer_df = store.get('influencers')
+            pending = views.begin_append('instagram')
+            def accepted_chunks():
+                for chunk in validated_chunks(read_upload(contents), 'instagram', influencer_df):
+                    pending.add(chunk)
+                    yield chunk
+            uploaded = store.append('instagram', accepted_chunks())
+            if not uploaded:
+                return html.Div("❌ The file has no Instagram records", style={'color': '#e74c3c'})
+            pending.commit()
+            
+            return html.Div(f"✅ Successfully uploaded {uploaded} Instagram records!", style={'color': '#27ae60'})
+            
+        except UploadRejected as e:
+            return html.Div(f"❌ {e}", style={'color': '#e74c3c'})
         except Exception as e:
             return html.Div(f"❌ Error: {str(e)}", style={'color': '#e74c3c'})
     
@@ -2125,35 +2262,23 @@ def upload_instagram_data(contents, filename):
 def upload_youtube_data(contents, filename):
     if contents is not None:
         try:
-            import base64
-            import io
-            
-            # Decode the uploaded file
-            content_type, content_string = contents.split(',')
-            decoded = base64.b64decode(content_string)
-            df_new = pd.read_csv(io.StringIO(decoded.decode('utf-8')))
-            
-            # Validate required columns for YouTube data
-            required_cols = ['influencer_id', 'impressions_ctr_percentage', 'audience_retention_percentage', 'subscribers_gained', 'watch_time_hours']
-            missing_cols = [col for col in required_cols if col not in df_new.columns]
-            if missing_cols:
-                return html.Div(f"❌ Missing required columns: {missing_cols}", style={'color': '#e74c3c'})
-            
-            # Check if influencers exist and are YouTube influencers
-            existing_youtube_influencers = set(influencer_df[influencer_df['platform'] == 'YouTube']['influencer_id'])
-            new_influencers = set(df_new['influencer_id'])
-            invalid_influencers = new_influencers - existing_youtube_influencers
-            
-            if invalid_influencers:
-                return html.Div(f"❌ Invalid influencer IDs for YouTube: {list(invalid_influencers)}", style={'color': '#e74c3c'})
-            
-            # Append to existing YouTube data
-            existing_df = pd.read_csv('data/youtube_analytics_data.csv')
-            combined_df = pd.concat([existing_df, df_new], ignore_index=True)
-            combined_df.to_csv('data/youtube_analytics_data.csv', index=False)
-            
-            return html.Div(f"✅ Successfully uploaded {len(df_new)} YouTube records!", style={'color': '#27ae60'})
-            
+            # Parse, validate (see validation.UPLOAD_SCHEMAS) and append the upload
+            # chunk by chunk, folding each chunk into the KPI totals as it goes
+            influencer_df = store.get('influencers')
+            pending = views.begin_append('youtube')
+            def accepted_chunks():
+                for chunk in validated_chunks(read_upload(contents), 'youtube', influencer_df):
+                    pending.add(chunk)
+                    yield chunk
+            uploaded = store.append('youtube', accepted_chunks())
+            if not uploaded:
+                return html.Div("❌ The file has no YouTube records", style={'color': '#e74c3c'})
+            pending.commit()
+            
+            return html.Div(f"✅ Successfully uploaded {uploaded} YouTube records!", style={'color': '#27ae60'})
+            
+        except UploadRejected as e:
+            return html.Div(f"❌ {e}", style={'color': '#e74c3c'})
         except Exception as e:
             return html.Div(f"❌ Error: {str(e)}", style={'color': '#e74c3c'})
     
@@ -2167,50 +2292,28 @@ def upload_youtube_data(contents, filename):
 def upload_payout_data(contents, filename):
     if contents is not None:
         try:
-            import base64
-            import io
-            
-            # Decode the uploaded file
-            content_type, content_string = contents.split(',')
-            decoded = base64.b64decode(content_string)
-            df_new = pd.read_csv(io.StringIO(decoded.decode('utf-8')))
-            
-            # Validate required columns for Payouts
-            required_cols = ['influencer_id', 'orders', 'total_revenue', 'total_cost']
-            missing_cols = [col for col in required_cols if col not in df_new.columns]
-            if missing_cols:
-                return html.Div(f"❌ Missing required columns: {missing_cols}", style={'color': '#e74c3c'})
-            
-            # Check if influencers exist
-            existing_influencers = set(influencer_df['influencer_id'])
-            new_influencers = set(df_new['influencer_id'])
-            invalid_influencers = new_influencers - existing_influencers
-            
-            if invalid_influencers:
-                return html.Div(f"❌ Invalid influencer IDs: {list(invalid_influencers)}", style={'color': '#e74c3c'})
-            
-            # For payouts, we'll add the new data to existing influencer totals
-            existing_df = pd.read_csv('data/payouts.csv')
-            
-            # Aggregate new data by influencer
-            for _, new_row in df_new.iterrows():
-                influencer_id = new_row['influencer_id']
-                existing_row_idx = existing_df[existing_df['influencer_id'] == influencer_id].index
-                
-                if len(existing_row_idx) > 0:
-                    # Add to existing influencer
-                    idx = existing_row_idx[0]
-                    existing_df.loc[idx, 'orders'] += new_row['orders']
-                    existing_df.loc[idx, 'total_revenue'] += new_row['total_revenue']
-                    existing_df.loc[idx, 'total_cost'] += new_row['total_cost']
-                else:
-                    # New influencer entry
-                    existing_df = pd.concat([existing_df, new_row.to_frame().T], ignore_index=True)
-            
-            existing_df.to_csv('data/payouts.csv', index=False)
-            
-            return html.Div(f"✅ Successfully uploaded {len(df_new)} payout records!", style={'color': '#27ae60'})
-            
+            influencer_df = store.get('influencers')
+            
+            # For payouts, the new data is added to existing influencer totals
+            # when the segment is read (see data_store.upsert_payouts). Each
+            # chunk is aggregated by influencer before it is written.
+            existing_payouts = store.get('payouts', columns=['influencer_id'])
+            aggregated = []
+            uploaded = 0
+            for chunk in validated_chunks(read_upload(contents), 'payouts', influencer_df):
+                aggregated.append(aggregate_payout_upload(chunk))
+                uploaded += len(chunk)
+            if not uploaded:
+                return html.Div("❌ The file has no payout records", style={'color': '#e74c3c'})
+            store.append('payouts', aggregated)
+            diff = payout_upsert_diff(existing_payouts, pd.concat(aggregated, ignore_index=True))
+            updated = (diff['status'] == 'updated').sum()
+            
+            return html.Div(f"✅ Successfully uploaded {uploaded} payout records! "
+                            f"({updated} influencers updated, {len(diff) - updated} added)", style={'color': '#27ae60'})
+            
+        except UploadRejected as e:
+            return html.Div(f"❌ {e}", style={'color': '#e74c3c'})
         except Exception as e:
             return html.Div(f"❌ Error: {str(e)}", style={'color': '#e74c3c'})
     
@@ -2225,41 +2328,38 @@ def upload_payout_data(contents, filename):
 def export_csv_data(n_clicks):
     if n_clicks:
         try:
+            payout_df = store.get('payouts')
+            influencer_df = store.get('influencers')
+            instagram_df = store.get('instagram')
+            geographic_distribution_df = store.get('geographic_distribution')
+
             # Create a zip file containing displayed analytics data
             buffer = io.BytesIO()
             
             with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
                 # 1. Top Performing Influencers (main dashboard table)
-                merged_df = pd.merge(payout_df, influencer_df, on='influencer_id')
-                merged_df['roas'] = merged_df['total_revenue'] / merged_df['total_cost']
-                top_performers = merged_df.nlargest(10, 'roas')[['name', 'category', 'platform', 'orders', 'total_revenue', 'roas']]
+                merged_df = views.get('performer_ranking')
+                top_performers = merged_df.head(10)[['name', 'category', 'platform', 'orders', 'total_revenue', 'roas']]
                 zip_file.writestr("top_performing_influencers.csv", top_performers.to_csv(index=False))
                 
                 # 2. Platform Performance Summary
-                platform_summary = influencer_df.groupby('platform').agg({
-                    'follower_count': 'sum',
-                    'influencer_id': 'count'
-                }).reset_index()
-                platform_summary.columns = ['Platform', 'Total_Followers', 'Influencer_Count']
+                platform_summary = views.get('platform_stats').set_axis(
+                    ['Platform', 'Total_Followers', 'Influencer_Count'], axis=1)
                 zip_file.writestr("platform_performance.csv", platform_summary.to_csv(index=False))
                 
                 # 3. Category Breakdown
-                category_summary = influencer_df.groupby('category').agg({
-                    'follower_count': 'sum',
-                    'influencer_id': 'count'
-                }).reset_index()
-                category_summary.columns = ['Category', 'Total_Followers', 'Influencer_Count']
+                category_summary = views.get('category_stats').set_axis(
+                    ['Category', 'Total_Followers', 'Influencer_Count'], axis=1)
                 zip_file.writestr("category_breakdown.csv", category_summary.to_csv(index=False))
                 
-                # 4. Payout Tracking Summary (all influencers with key metrics)
+                # 4. Payout Tracking Summary (all influencers with key metrics, ranked by ROAS)
                 payout_summary = merged_df[['name', 'platform', 'category', 'basis', 'rate', 
                                           'orders', 'total_revenue', 'payout_amount', 'total_cost', 'roas']].copy()
-                payout_summary = payout_summary.sort_values('roas', ascending=False)
                 zip_file.writestr("payout_tracking_summary.csv", payout_summary.to_csv(index=False))
                 
                 # 5. CAC Analysis Data
                 try:
-                    if not tracking_data_df.empty:
+                    if backend.has_rows('tracking'):
                         cost_orders = payout_df.merge(influencer_df[['influencer_id', 'platform']], on='influencer_id')
                         cost_orders['unique_customers'] = (cost_orders['orders'] * 0.8).astype(int)  # Static 80% unique rate
                         cost_orders['cac'] = cost_orders['total_cost'] / cost_orders['unique_customers'].replace(0, np.nan)
@@ -2271,7 +2371,7 @@ def export_csv_data(n_clicks):
                         zip_file.writestr("cac_analysis_by_influencer.csv", cac_data.to_csv(index=False))
                         
                         # CAC by platform
-                        cac_by_platform = cost_orders.groupby('platform').agg({
+                        cac_by_platform = cost_orders.groupby('platform', observed=True).agg({
                             'total_cost': 'sum',
                             'unique_customers': 'sum'
                         }).reset_index()
@@ -2297,7 +2397,7 @@ def export_csv_data(n_clicks):
                 # 7. Instagram Insights Summary
                 try:
                     if not instagram_df.empty:
-                        instagram_summary = instagram_df.groupby('influencer_id').agg({
+                        instagram_summary = instagram_df.groupby('influencer_id', observed=True).agg({
                             'likes': 'sum',
                             'comments': 'sum',
                             'saves': 'sum',
@@ -2332,23 +2432,17 @@ def export_csv_data(n_clicks):
 def export_pdf_report(n_clicks):
     if n_clicks:
         try:
+            headline = views.get('headline_metrics')
+            total_orders = headline['total_orders']
+            total_revenue = headline['total_revenue']
+            total_roas = headline['total_roas']
+            total_followers = headline['total_followers']
+            estimated_reach = headline['estimated_reach']
+            
             # Generate charts as base64 images for PDF inclusion
             
             # 1. Brand Performance Chart
-            try:
-                brand_df = pd.read_csv('data/brand_performance.csv')
-                brand_df.columns = ['Brand', 'Campaigns', 'Reach', 'Revenue', 'Cost', 'ROAS']
-            except:
-                posts_df_temp = pd.read_csv('data/posts.csv')
-                brand_performance = posts_df_temp.groupby('brand_mentioned').agg({
-                    'post_id': 'count',
-                    'reach': 'sum'
-                }).reset_index()
-                brand_performance['revenue'] = brand_performance['reach'] * 0.05
-                brand_performance['cost'] = brand_performance['post_id'] * 50000
-                brand_performance['roas'] = brand_performance['revenue'] / brand_performance['cost']
-                brand_performance.columns = ['Brand', 'Campaigns', 'Reach', 'Revenue', 'Cost', 'ROAS']
-                brand_df = brand_performance.sort_values('Revenue', ascending=False)
+            brand_df = views.get('brand_performance')
             
             brand_fig = go.Figure()
             brand_fig.add_trace(go.Bar(
@@ -2369,10 +2463,7 @@ def export_pdf_report(n_clicks):
             brand_chart_base64 = base64.b64encode(brand_fig.to_image(format="png", width=600, height=300)).decode()
             
             # 2. Platform Distribution Pie Chart
-            platform_stats = influencer_df.groupby('platform').agg({
-                'follower_count': 'sum',
-                'influencer_id': 'count'
-            }).reset_index()
+            platform_stats = views.get('platform_stats')
             
             platform_fig = go.Figure(data=[go.Pie(
                 labels=platform_stats['platform'],
@@ -2389,9 +2480,7 @@ def export_pdf_report(n_clicks):
             platform_chart_base64 = base64.b64encode(platform_fig.to_image(format="png", width=600, height=300)).decode()
             
             # 3. ROAS Performance Chart
-            merged_df = pd.merge(payout_df, influencer_df, on='influencer_id')
-            merged_df['roas'] = merged_df['total_revenue'] / merged_df['total_cost']
-            top_performers = merged_df.nlargest(5, 'roas')
+            top_performers = views.get('performer_ranking').head(5)
             
             roas_fig = go.Figure()
             roas_fig.add_trace(go.Bar(
@@ -2640,38 +2729,52 @@ def download_youtube_sample(n_clicks):
     return None
 
 
+# ==================== CLIENTSIDE CALLBACKS ====================
+# Interactions that only change how the page looks (opening and closing the
+# help modal) run as clientside callbacks in the browser and never reach the
+# server, so they do not queue behind analytics requests on busy workers.
+# Every callback that reads the DataStore, builds a figure from data, or sends
+# a file stays a server callback (@app.callback).
+
 # Modal callback for help popup
-@app.callback(
+app.clientside_callback(
+    """
+    function(helpClicks, closeClicks, currentStyle) {
+        const triggered = dash_clientside.callback_context.triggered;
+        if (triggered.length && triggered[0].prop_id === 'data-help-btn.n_clicks') {
+            // Open modal
+            return {
+                position: 'fixed',
+                top: '0',
+                left: '0',
+                width: '100%',
+                height: '100%',
+                backgroundColor: 'rgba(0,0,0,0.5)',
+                zIndex: '1000',
+                display: 'block'
+            };
+        }
+        // Close modal
+        return {display: 'none'};
+    }
+    """,
     Output('help-modal', 'style'),
     [Input('data-help-btn', 'n_clicks'),
      Input('modal-close-btn', 'n_clicks')],
     [State('help-modal', 'style')],
     prevent_initial_call=True
 )
-def toggle_help_modal(help_clicks, close_clicks, current_style):
-    ctx = dash.callback_context
-    if not ctx.triggered:
-        return {'display': 'none'}
-    
-    button_id = ctx.triggered[0]['prop_id'].split('.')[0]
-    
-    if button_id == 'data-help-btn':
-        # Open modal
-        return {
-            'position': 'fixed',
-            'top': '0',
-            'left': '0',
-            'width': '100%',
-            'height': '100%',
-            'backgroundColor': 'rgba(0,0,0,0.5)',
-            'zIndex': '1000',
-            'display': 'block'
-        }
-    elif button_id == 'modal-close-btn':
-        # Close modal
-        return {'display': 'none'}
-    
-    return {'display': 'none'}
+
+
+# Under gunicorn preload (see gunicorn.conf.py) the master builds the whole
+# snapshot - every in-memory dataset and the views over them, including those
+# registered above - before forking, and the workers share it copy-on-write
+# instead of each parsing the data on its own. BACKEND_DATASETS stay in SQLite.
+if os.environ.get('PRELOAD_DATA', '0') == '1':
+    store.sync()
+    store.refresh(IN_MEMORY_DATASETS)
+    views.materialize([name for name, (datasets, _) in views.views.items()
+                       if not set(datasets) & set(BACKEND_DATASETS)])
 
 
 if __name__ == '__main__':
@@ -0,0 +1,136 @@
+import math
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+# A filter_query term: '{column} operator value'. The operator is read only
+# right after the column name, never from inside the value.
+FILTER_TERM = re.compile(
+    r'^\s*\{(?P<name>(?:[^}\\]|\\.)*)\}'
+    r'\s*(?P<operator>>=|<=|!=|<|>|=|[a-z]+)'
+    r'\s*(?P<value>.*?)\s*$', re.S)
+
+# DataTable filter operators, by spelling. Word operators also come with an
+# 'i' (case-insensitive) or 's' (case-sensitive) prefix, e.g. icontains.
+FILTER_OPERATORS = {
+    '>=': '>=', 'ge': '>=', '<=': '<=', 'le': '<=', '<': '<', 'lt': '<', '>': '>', 'gt': '>',
+    '!=': '!=', 'ne': '!=', '=': '=', 'eq': '=',
+    'contains': 'contains', 'datestartswith': 'datestartswith',
+}
+
+COMPARISONS = {
+    '>=': lambda values, value: values >= value,
+    '<=': lambda values, value: values <= value,
+    '<': lambda values, value: values < value,
+    '>': lambda values, value: values > value,
+    '!=': lambda values, value: values != value,
+    '=': lambda values, value: values == value,
+}
+
+
+def split_filter_part(filter_part):
+    """
+    (column, operator, value, case_sensitive) of one term of a filter_query;
+    all None if the term is not understood. Unprefixed operators are case
+    sensitive, like the DataTable's default filter_options.
+    """
+    match = FILTER_TERM.match(filter_part)
+    if match is None:
+        return None, None, None, None
+    spelling = match.group('operator')
+    case_sensitive = True
+    if spelling not in FILTER_OPERATORS and spelling[:1] in ('i', 's') and spelling[1:].isalpha():
+        case_sensitive = spelling[0] == 's'
+        spelling = spelling[1:]
+    operator = FILTER_OPERATORS.get(spelling)
+    if operator is None:
+        return None, None, None, None
+    name = re.sub(r'\\(.)', r'\1', match.group('name'))
+    value_part = match.group('value')
+    if len(value_part) > 1 and value_part[0] == value_part[-1] and value_part[0] in ('"', "'", '`'):
+        value = value_part[1:-1].replace('\\' + value_part[0], value_part[0])
+    else:
+        try:
+            value = float(value_part)
+        except ValueError:
+            value = value_part
+    return name, operator, value, case_sensitive
+
+
+def filter_mask(df, filter_query):
+    """
+    Rows of df matching a DataTable filter_query (terms joined by ' && ').
+    A term with an unsupported operator (e.g. 'is blank') matches no rows,
+    rather than being dropped and leaving the table looking filtered.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for part in filter_query.split(' && '):
+        column, operator, value, case_sensitive = split_filter_part(part)
+        if operator is None:
+            return np.zeros(len(df), dtype=bool)
+        if column not in df.columns:
+            continue
+        values = df[column]
+        if operator in ('contains', 'datestartswith'):
+            text = values.astype(str)
+            if operator == 'contains':
+                matched = text.str.contains(str(value), case=case_sensitive, regex=False)
+            else:
+                matched = text.str.startswith(str(value))
+        elif pd.api.types.is_numeric_dtype(values.dtype):
+            if not isinstance(value, float):
+                return np.zeros(len(df), dtype=bool)
+            matched = COMPARISONS[operator](values, value)
+        else:
+            text, value = values.astype(str), str(value)
+            if not case_sensitive:
+                text, value = text.str.lower(), value.lower()
+            matched = COMPARISONS[operator](text, value)
+        mask &= matched.fillna(False).to_numpy(dtype=bool)
+    return mask
+
+
+class SortedTable:
+    """
+    A table served one page at a time to a DataTable in custom paging,
+    sorting and filtering mode. The row order for each sort column is
+    computed once and kept, so an unfiltered page in any order is a slice of
+    a precomputed index; filters are whole-column masks over the table.
+    Results are shared between requests - do not mutate the frame.
+    """
+
+    def __init__(self, df):
+        self.df = df.reset_index(drop=True)
+        self._orders = {}
+        self._lock = threading.Lock()
+
+    def order(self, column, descending=False):
+        """Row positions sorted on a column (stable, missing values last)"""
+        key = (column, descending)
+        with self._lock:
+            order = self._orders.get(key)
+        if order is None:
+            values = self.df[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype(object)
+            order = values.sort_values(ascending=not descending, kind='stable',
+                                       na_position='last').index.to_numpy()
+            with self._lock:
+                self._orders[key] = order
+        return order
+
+    def page(self, page_current=0, page_size=10, sort_by=None, filter_query=None):
+        """(records of the requested page, number of pages) after filtering and sorting"""
+        sort_by = [s for s in (sort_by or []) if s.get('column_id') in self.df.columns]
+        if sort_by:
+            rows = self.order(sort_by[0]['column_id'], sort_by[0].get('direction') == 'desc')
+        else:
+            rows = np.arange(len(self.df))
+        if filter_query:
+            rows = rows[filter_mask(self.df, filter_query)[rows]]
+        page_size = page_size or 10
+        start = (page_current or 0) * page_size
+        page_count = max(1, math.ceil(len(rows) / page_size))
+        return self.df.take(rows[start:start + page_size]).to_dict('records'), page_count
@@ -0,0 +1,200 @@
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_store import DATE_FORMAT, MERGE_POLICIES, SCHEMAS, DataStore, apply_schema
+
+# Columns indexed in every SQLite table that has them
+INDEXED_COLUMNS = ('influencer_id', 'post_id', 'date', 'product')
+
+# Rows inserted per batch when a table is (re)built
+SQLITE_LOAD_CHUNK_ROWS = 100000
+
+
+def _quote(name):
+    return '"%s"' % name.replace('"', '""')
+
+
+class PandasBackend:
+    """Row lookups as boolean masks over the DataStore's in-memory frames"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def select(self, name, where=None, columns=None):
+        """Rows of a dataset whose columns equal the values in `where` (all columns if None)"""
+        where = where or {}
+        needed = None if columns is None else list(dict.fromkeys(list(where) + list(columns)))
+        df = self.store.get(name, columns=needed)
+        if where:
+            mask = np.ones(len(df), dtype=bool)
+            for col, value in where.items():
+                mask &= (df[col] == value).to_numpy()
+            df = df[mask]
+        return df if columns is None else df[list(columns)]
+
+    def has_rows(self, name):
+        return len(self.store.get(name)) > 0
+
+
+class SQLiteBackend:
+    """
+    Row lookups as parameterized queries against an on-disk SQLite copy of the
+    datasets, indexed on INDEXED_COLUMNS. Lookups only read matching rows, so
+    datasets do not need to fit in memory.
+    A table is rebuilt (streamed from the CSVs) when its dataset's files
+    change; the database file is shared by every worker.
+    """
+
+    def __init__(self, store, path=None):
+        self.store = store
+        self.path = path or os.path.join(store.data_dir, 'healthkart.sqlite')
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._tables = {}
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS _meta (name TEXT PRIMARY KEY, signature TEXT, columns TEXT)')
+            self._local.conn = conn
+        return conn
+
+    def _chunks(self, name):
+        if name in MERGE_POLICIES:
+            # Merged datasets (payouts) are small; build from the merged frame
+            yield self.store.get(name)
+            return
+        yield from self.store.iter_chunks(name, SQLITE_LOAD_CHUNK_ROWS)
+
+    def _build(self, conn, name, signature):
+        conn.execute(f'DROP TABLE IF EXISTS {_quote(name)}')
+        columns = []
+        for chunk in self._chunks(name):
+            if not len(chunk.columns):
+                continue
+            chunk = chunk.astype({col: object for col in chunk.columns
+                                  if isinstance(chunk[col].dtype, pd.CategoricalDtype)})
+            for col in chunk.columns:
+                if pd.api.types.is_datetime64_dtype(chunk[col].dtype):
+                    chunk[col] = chunk[col].dt.strftime(DATE_FORMAT)
+            if not columns:
+                conn.execute(pd.io.sql.get_schema(chunk, name))
+                columns = list(chunk.columns)
+            for col in chunk.columns:
+                if col not in columns:
+                    conn.execute(f'ALTER TABLE {_quote(name)} ADD COLUMN {_quote(col)}')
+                    columns.append(col)
+            insert = 'INSERT INTO %s (%s) VALUES (%s)' % (
+                _quote(name), ', '.join(_quote(c) for c in chunk.columns), ', '.join('?' * len(chunk.columns)))
+            conn.executemany(insert, chunk.astype(object).where(chunk.notna(), None).itertuples(index=False))
+        for col in INDEXED_COLUMNS:
+            if col in columns:
+                conn.execute(f'CREATE INDEX {_quote("idx_%s_%s" % (name, col))} ON {_quote(name)} ({_quote(col)})')
+        conn.execute('INSERT OR REPLACE INTO _meta VALUES (?, ?, ?)', (name, signature, '\t'.join(columns)))
+        return columns
+
+    def _table(self, name):
+        """Columns of the up-to-date table for a dataset (building it if needed)"""
+        signature = repr(self.store.signature(name))
+        with self._lock:
+            cached = self._tables.get(name)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        conn = self._connection()
+        # BEGIN IMMEDIATE takes the write lock, so only one worker rebuilds a table
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT signature, columns FROM _meta WHERE name = ?', (name,)).fetchone()
+            if row is not None and row[0] == signature:
+                columns = row[1].split('\t') if row[1] else []
+            else:
+                columns = self._build(conn, name, signature)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        with self._lock:
+            self._tables[name] = (signature, columns)
+        return columns
+
+    def query(self, sql, params=(), name=None, chunksize=None):
+        """
+        Run a parameterized query; `name` makes sure that dataset's table is
+        current first (an empty result if the dataset has no file). With
+        `chunksize`, returns an iterator of frames streamed from the cursor.
+        """
+        if name is not None and not self._table(name):
+            return iter([]) if chunksize else pd.DataFrame()
+        return pd.read_sql_query(sql, self._connection(), params=list(params), chunksize=chunksize)
+
+    def has_rows(self, name):
+        return not self.query(f'SELECT 1 FROM {_quote(name)} LIMIT 1', name=name).empty
+
+    def select(self, name, where=None, columns=None):
+        """Rows of a dataset whose columns equal the values in `where` (all columns if None)"""
+        where = where or {}
+        table_columns = self._table(name)
+        if not table_columns:
+            return pd.DataFrame(columns=list(columns or []))
+        sql = 'SELECT %s FROM %s' % ('*' if columns is None else ', '.join(_quote(c) for c in columns), _quote(name))
+        if where:
+            sql += ' WHERE ' + ' AND '.join(f'{_quote(col)} = ?' for col in where)
+        df = pd.read_sql_query(sql, self._connection(), params=[
+            value.item() if isinstance(value, np.generic) else value for value in where.values()])
+        return apply_schema(df, SCHEMAS.get(name, {}))
+
+
+# Lookups the dashboard makes, as (dataset, column, values to look up, columns returned)
+def benchmark_workloads(store, lookups=20):
+    influencer_ids = list(store.get('influencers')['influencer_id'].astype(object))[:lookups]
+    post_ids = list(store.get('posts', columns=['post_id'])['post_id'].astype(object))[:lookups]
+    tracking_df = store.get('tracking')
+    products = list(pd.unique(tracking_df['product'].astype(object)))[:lookups] if 'product' in tracking_df else []
+    return [
+        ('tracking', 'influencer_id', influencer_ids, ['orders', 'revenue', 'user_id', 'product']),
+        ('tracking', 'product', products, ['influencer_id', 'orders', 'revenue']),
+        ('instagram', 'influencer_id', influencer_ids, None),
+        ('youtube', 'influencer_id', influencer_ids, None),
+        ('posts', 'post_id', post_ids, None),
+        ('influencers', 'influencer_id', influencer_ids, None),
+    ]
+
+
+def benchmark(store, backends, workloads=None, repeat=3):
+    """
+    Time the same lookups against each backend. The first pass warms caches
+    (frame loads, table builds) and is reported separately.
+    Returns one row per (backend, workload).
+    """
+    rows = []
+    for dataset, column, values, columns in (workloads or benchmark_workloads(store)):
+        for backend_name, backend in backends.items():
+            start = time.perf_counter()
+            results = [backend.select(dataset, {column: value}, columns) for value in values]
+            warm_up = time.perf_counter() - start
+            start = time.perf_counter()
+            for _ in range(repeat):
+                for value in values:
+                    backend.select(dataset, {column: value}, columns)
+            per_lookup = (time.perf_counter() - start) / max(repeat * len(values), 1)
+            rows.append({
+                'backend': backend_name,
+                'workload': f'{dataset}.{column}',
+                'lookups': len(values),
+                'rows_matched': sum(len(r) for r in results),
+                'first_pass_s': warm_up,
+                'per_lookup_ms': per_lookup * 1000,
+            })
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    store = DataStore('data')
+    print(benchmark(store, {'pandas': PandasBackend(store), 'sqlite': SQLiteBackend(store)}).to_string(index=False))
@@ -0,0 +1,121 @@
+import pandas as pd
+
+from data_store import DATE_FORMAT, SCHEMAS
+
+# Rows kept per violated rule to show what went wrong
+SAMPLE_ROWS = 5
+
+# Upload rules per dataset. Column types come from data_store.SCHEMAS: every
+# numeric column must parse as a number (a whole number for int64 columns) and
+# must not be negative.
+#   required      columns that must be present and non-empty
+#   dates         column -> format its values must match
+#   foreign_keys  column -> platform its influencer_id must belong to in
+#                 influencers.csv (None for any platform)
+UPLOAD_SCHEMAS = {
+    'instagram': {
+        'required': ['influencer_id', 'likes', 'comments', 'saves', 'reach', 'impressions'],
+        'dates': {'date': DATE_FORMAT},
+        'foreign_keys': {'influencer_id': 'Instagram'},
+    },
+    'youtube': {
+        'required': ['influencer_id', 'impressions_ctr_percentage', 'audience_retention_percentage',
+                     'subscribers_gained', 'watch_time_hours'],
+        'dates': {'date': DATE_FORMAT},
+        'foreign_keys': {'influencer_id': 'YouTube'},
+    },
+    'payouts': {
+        'required': ['influencer_id', 'orders', 'total_revenue', 'total_cost'],
+        'foreign_keys': {'influencer_id': None},
+    },
+    'posts': {
+        'required': ['post_id', 'influencer_id', 'platform', 'date', 'brand_mentioned'],
+        'dates': {'date': DATE_FORMAT},
+        'foreign_keys': {'influencer_id': None},
+    },
+    'tracking': {
+        'required': ['influencer_id', 'user_id', 'product', 'date', 'orders', 'revenue'],
+        'dates': {'date': DATE_FORMAT},
+        'foreign_keys': {'influencer_id': None},
+    },
+}
+
+
+def _violation(rule, column, mask, df):
+    count = int(mask.sum())
+    if not count:
+        return None
+    sample = df[mask.to_numpy()].head(SAMPLE_ROWS)
+    return {
+        'rule': rule,
+        'column': column,
+        'count': count,
+        # File line numbers, counting the header as line 1
+        'lines': [int(i) + 2 for i in sample.index],
+        'sample': sample.to_dict('records'),
+    }
+
+
+def validate_frame(name, df, influencer_df):
+    """
+    Check df against the upload schema of dataset `name` with whole-column checks.
+    Returns one entry per violated rule (rule, column, count, lines, sample);
+    an empty list means the frame is valid.
+    """
+    spec = UPLOAD_SCHEMAS[name]
+    missing_cols = [col for col in spec['required'] if col not in df.columns]
+    if missing_cols:
+        return [{'rule': 'required_columns', 'column': None, 'count': len(missing_cols),
+                 'lines': [], 'sample': missing_cols}]
+
+    violations = [_violation('missing_value', col, df[col].isna(), df) for col in spec['required']]
+    for col, dtype in SCHEMAS.get(name, {}).items():
+        if dtype not in ('int64', 'float64') or col not in df.columns:
+            continue
+        values = pd.to_numeric(df[col], errors='coerce')
+        violations.append(_violation('type', col, df[col].notna() & values.isna(), df))
+        if dtype == 'int64':
+            violations.append(_violation('integer', col, values % 1 > 0, df))
+        violations.append(_violation('non_negative', col, values < 0, df))
+    for col, date_format in spec.get('dates', {}).items():
+        if col in df.columns:
+            parsed = pd.to_datetime(df[col], format=date_format, errors='coerce')
+            violations.append(_violation('date_format', col, df[col].notna() & parsed.isna(), df))
+    for col, platform in spec.get('foreign_keys', {}).items():
+        valid = influencer_df if platform is None else influencer_df[influencer_df['platform'] == platform]
+        unknown = df[col].notna() & ~df[col].astype(object).isin(valid['influencer_id'].astype(object))
+        violations.append(_violation('foreign_key', col, unknown, df))
+    return [v for v in violations if v is not None]
+
+
+def merge_violations(violations, more):
+    """
+    Violations of an upload validated in chunks: counts of the same rule and
+    column add up, and samples are kept until SAMPLE_ROWS
+    """
+    merged = {(v['rule'], v['column']): v for v in violations}
+    for v in more:
+        key = (v['rule'], v['column'])
+        total = merged.get(key)
+        if total is None:
+            merged[key] = v
+            continue
+        room = SAMPLE_ROWS - len(total['sample'])
+        merged[key] = dict(total, count=total['count'] + v['count'],
+                           lines=total['lines'] + v['lines'][:room],
+                           sample=total['sample'] + v['sample'][:room])
+    return list(merged.values())
+
+
+def describe_violations(violations):
+    """Short human-readable summary of validate_frame() output"""
+    messages = []
+    for v in violations:
+        if v['rule'] == 'required_columns':
+            messages.append(f"Missing required columns: {v['sample']}")
+        elif v['rule'] == 'foreign_key':
+            values = sorted({str(row[v['column']]) for row in v['sample']})
+            messages.append(f"{v['count']} rows with invalid {v['column']} (e.g. {values})")
+        else:
+            messages.append(f"{v['rule']} check failed for {v['column']} in {v['count']} rows (lines {v['lines']})")
+    return '; '.join(messages)
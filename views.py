@@ -0,0 +1,358 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from cohorts import COHORT_COLUMNS, CohortLTV
+
+
+class RunningTotals:
+    """
+    Column sums and non-null counts that can be extended with appended rows.
+    Instances are never modified in place; add() returns a new one, so readers
+    holding the previous totals always see a consistent snapshot.
+    """
+
+    def __init__(self, columns, sums=None, counts=None, rows=0):
+        self.columns = tuple(columns)
+        self.sums = dict(sums) if sums else dict.fromkeys(self.columns, 0)
+        self.counts = dict(counts) if counts else dict.fromkeys(self.columns, 0)
+        self.rows = rows
+
+    def add(self, df):
+        totals = RunningTotals(self.columns, self.sums, self.counts, self.rows + len(df))
+        for col in self.columns:
+            if col in df.columns:
+                totals.sums[col] = totals.sums[col] + df[col].sum()
+                totals.counts[col] = totals.counts[col] + df[col].count()
+        return totals
+
+    def sum(self, col):
+        return self.sums[col]
+
+    def mean(self, col):
+        return self.sums[col] / self.counts[col] if self.counts[col] else np.nan
+
+
+# ---------- VIEW BUILDERS ----------
+# Each builder receives the ViewRegistry and returns the aggregate it
+# materializes. Results are shared between requests - do not mutate them.
+
+def build_platform_stats(views):
+    """Follower totals and influencer counts per platform"""
+    influencer_df = views.store.get('influencers')
+    return influencer_df.groupby('platform', observed=True).agg(
+        follower_count=('follower_count', 'sum'),
+        influencer_count=('influencer_id', 'count')
+    ).reset_index()
+
+
+def build_category_stats(views):
+    """Follower totals and influencer counts per category"""
+    influencer_df = views.store.get('influencers')
+    return influencer_df.groupby('category', observed=True).agg(
+        follower_count=('follower_count', 'sum'),
+        influencer_count=('influencer_id', 'count')
+    ).reset_index()
+
+
+def build_brand_performance(views):
+    """
+    Brand revenue, cost and ROAS from brand_performance.csv, or estimated
+    from posts reach when that file is missing or empty
+    """
+    brand_df = views.store.get('brand_performance')
+    if not brand_df.empty:
+        return brand_df.set_axis(['Brand', 'Campaigns', 'Reach', 'Revenue', 'Cost', 'ROAS'], axis=1)
+    posts_df = views.store.get('posts')
+    brand_performance = posts_df.groupby('brand_mentioned', observed=True).agg({
+        'post_id': 'count',
+        'reach': 'sum'
+    }).reset_index()
+    brand_performance['revenue'] = brand_performance['reach'] * 0.05  # 5% conversion
+    brand_performance['cost'] = brand_performance['post_id'] * 50000  # ₹50k per campaign
+    brand_performance['roas'] = brand_performance['revenue'] / brand_performance['cost']
+    brand_performance.columns = ['Brand', 'Campaigns', 'Reach', 'Revenue', 'Cost', 'ROAS']
+    return brand_performance.sort_values('Revenue', ascending=False)
+
+
+def build_payout_overview(views):
+    """
+    Payouts joined with influencer details, with ROAS: the one payouts x
+    influencers merge shared by the overview panels and the exports
+    """
+    merged_df = pd.merge(views.store.get('payouts'), views.store.get('influencers'), on='influencer_id')
+    merged_df['roas'] = merged_df['total_revenue'] / merged_df['total_cost']
+    return merged_df
+
+
+def build_performer_ranking(views):
+    """Payout overview ranked by ROAS (best first)"""
+    return views.get('payout_overview').sort_values('roas', ascending=False, kind='stable', na_position='last')
+
+
+def build_top_products(views):
+    """Brand engagement totals from posts, ranked by engagement score"""
+    posts_df = views.store.get('posts')
+    products_performance = posts_df.groupby('brand_mentioned', observed=True).agg({
+        'likes': 'sum',
+        'comments': 'sum',
+        'shares': 'sum',
+        'reach': 'sum',
+        'video_views': 'sum'
+    }).reset_index()
+    products_performance['engagement_score'] = (
+        products_performance['likes'] +
+        products_performance['comments'] * 3 +
+        products_performance['shares'] * 5 +
+        products_performance['video_views'] * 0.5
+    )
+    return products_performance.sort_values('engagement_score', ascending=False, kind='stable')
+
+
+def build_campaign_kpis(views):
+    """Headline numbers for the campaign performance cards"""
+    payout_df = views.store.get('payouts')
+    brand_df = views.get('brand_performance')
+    revenue = brand_df['Revenue'].dropna()
+    if revenue.empty:
+        best_brand = {'brand': 'N/A', 'revenue': 0}
+    else:
+        best = brand_df.loc[revenue.idxmax()]
+        best_brand = {'brand': best['Brand'], 'revenue': best['Revenue']}
+    return {
+        'total_campaigns': len(payout_df),
+        'avg_campaign_roas': (payout_df['total_revenue'] / payout_df['total_cost']).mean(),
+        'total_influencers': len(views.store.get('influencers')),
+        'avg_orders_per_campaign': payout_df['orders'].mean(),
+        'best_brand': best_brand,
+    }
+
+
+def build_headline_metrics(views):
+    """Totals behind the header KPI cards and the PDF report summary"""
+    payout_df = views.store.get('payouts')
+    total_revenue = payout_df['total_revenue'].sum()
+    total_cost = payout_df['total_cost'].sum()
+    total_followers = views.store.get('influencers')['follower_count'].sum()
+    return {
+        'total_orders': payout_df['orders'].sum(),
+        'total_revenue': total_revenue,
+        'total_cost': total_cost,
+        'total_roas': total_revenue / total_cost,
+        'total_followers': total_followers,
+        # Estimated impressions based on follower count, assuming a 40% organic reach rate
+        'estimated_reach': total_followers * 0.4,
+    }
+
+
+INSTAGRAM_TOTAL_COLUMNS = ('likes', 'comments', 'saves', 'reach', 'impressions',
+                           'story_completion_rate', 'profile_visits', 'website_clicks')
+YOUTUBE_TOTAL_COLUMNS = ('impressions_ctr_percentage', 'audience_retention_percentage',
+                         'subscribers_gained', 'watch_time_hours')
+
+
+def build_instagram_totals(views):
+    """Running sums/counts behind the Instagram KPI cards"""
+    instagram_df = views.store.get('instagram', columns=list(INSTAGRAM_TOTAL_COLUMNS))
+    return RunningTotals(INSTAGRAM_TOTAL_COLUMNS).add(instagram_df)
+
+
+def build_youtube_totals(views):
+    """Running sums/counts behind the YouTube KPI cards"""
+    youtube_df = views.store.get('youtube', columns=list(YOUTUBE_TOTAL_COLUMNS))
+    return RunningTotals(YOUTUBE_TOTAL_COLUMNS).add(youtube_df)
+
+
+# Tracking columns behind the Influencer Deep Dive panel
+TRACKING_SUMMARY_COLUMNS = ['influencer_id', 'orders', 'revenue', 'user_id', 'product']
+
+
+def summarize_tracking(rows):
+    """Deep-dive numbers for one influencer's tracking rows"""
+    top_products = rows.groupby('product', observed=True).agg({
+        'orders': 'sum',
+        'revenue': 'sum'
+    }).sort_values('revenue', ascending=False, kind='stable').head(3)
+    return {
+        'total_orders': rows['orders'].sum(),
+        'total_revenue': rows['revenue'].sum(),
+        'unique_customers': rows['user_id'].nunique(),
+        'top_products': top_products,
+    }
+
+
+class InfluencerPartitions:
+    """
+    Each influencer's deep-dive summary (totals, unique customers, top-3
+    products), computed up front in one grouped pass over the tracking table,
+    so a lookup never scans the table. Only the per-influencer results are
+    kept, not the rows.
+    """
+
+    def __init__(self, tracking_df):
+        tracking_df = tracking_df.reindex(columns=TRACKING_SUMMARY_COLUMNS)
+        ids = tracking_df['influencer_id'].astype('category')
+        totals = tracking_df.groupby(ids, observed=True).agg(
+            total_orders=('orders', 'sum'),
+            total_revenue=('revenue', 'sum'),
+            unique_customers=('user_id', 'nunique')
+        )
+        by_product = tracking_df.groupby([ids, 'product'], observed=True)[['orders', 'revenue']].sum()
+        top_products = by_product.sort_values('revenue', ascending=False, kind='stable') \
+            .groupby(level=0, observed=True).head(3)
+        self._empty = summarize_tracking(tracking_df.iloc[:0])
+        self._summaries = {}
+        for influencer_id, orders, revenue, customers in zip(
+                totals.index, totals['total_orders'], totals['total_revenue'], totals['unique_customers']):
+            self._summaries[influencer_id] = {
+                'total_orders': orders,
+                'total_revenue': revenue,
+                'unique_customers': customers,
+                'top_products': top_products.xs(influencer_id, level=0),
+            }
+
+    def summary(self, influencer_id):
+        return self._summaries.get(influencer_id, self._empty)
+
+
+def build_influencer_partitions(views):
+    """Deep-dive summaries of every influencer in the tracking table"""
+    return InfluencerPartitions(views.store.get('tracking', columns=TRACKING_SUMMARY_COLUMNS))
+
+
+def build_cohort_ltv(views):
+    """First attributed order and windowed revenue of every tracked customer"""
+    return CohortLTV().add(views.store.get('tracking', columns=COHORT_COLUMNS))
+
+
+def add_appended_rows(totals, rows):
+    return totals.add(rows)
+
+
+# View name -> (datasets it reads, builder)
+DASHBOARD_VIEWS = {
+    'platform_stats': (('influencers',), build_platform_stats),
+    'category_stats': (('influencers',), build_category_stats),
+    'brand_performance': (('brand_performance', 'posts'), build_brand_performance),
+    'payout_overview': (('payouts', 'influencers'), build_payout_overview),
+    'performer_ranking': (('payouts', 'influencers'), build_performer_ranking),
+    'top_products': (('posts',), build_top_products),
+    'campaign_kpis': (('payouts', 'influencers', 'brand_performance', 'posts'), build_campaign_kpis),
+    'headline_metrics': (('payouts', 'influencers'), build_headline_metrics),
+    'influencer_partitions': (('tracking',), build_influencer_partitions),
+    'cohort_ltv': (('tracking',), build_cohort_ltv),
+    'instagram_totals': (('instagram',), build_instagram_totals),
+    'youtube_totals': (('youtube',), build_youtube_totals),
+}
+
+# View name -> updater(result, appended_rows) for views that can absorb rows
+# appended to their dataset without a full rebuild. An updater returns None
+# when the rows cannot be folded in, and the view is rebuilt on next use.
+INCREMENTAL_UPDATES = {
+    'instagram_totals': add_appended_rows,
+    'youtube_totals': add_appended_rows,
+    'cohort_ltv': add_appended_rows,
+}
+
+
+class ViewRegistry:
+    """
+    Materialized aggregates over a DataStore.
+    A view is rebuilt only when the version of one of the datasets it reads
+    changes; every other request is served the stored result.
+    """
+
+    def __init__(self, store, views=None, incremental=None):
+        self.store = store
+        self.views = dict(views or DASHBOARD_VIEWS)
+        self.incremental = dict(INCREMENTAL_UPDATES if incremental is None else incremental)
+        self._results = {}
+        self._lock = threading.Lock()
+        self._view_locks = {}
+
+    def _view_lock(self, name):
+        with self._lock:
+            return self._view_locks.setdefault(name, threading.RLock())
+
+    def version_key(self, name):
+        """Versions of the datasets a view reads"""
+        datasets, _ = self.views[name]
+        return tuple(self.store.dataset_version(dataset) for dataset in datasets)
+
+    def get(self, name):
+        key = self.version_key(name)
+        with self._view_lock(name):
+            cached = self._results.get(name)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            _, builder = self.views[name]
+            result = builder(self)
+            self._results[name] = (key, result)
+            return result
+
+    def _incremental_views(self, dataset):
+        return [name for name, (datasets, _) in self.views.items()
+                if dataset in datasets and name in self.incremental]
+
+    def _expected_key(self, name, dataset, previous_version):
+        """Version key the view had if it was current when `dataset` was at previous_version"""
+        datasets, _ = self.views[name]
+        key = self.version_key(name)
+        return key, tuple(previous_version if d == dataset else v for d, v in zip(datasets, key))
+
+    def begin_append(self, dataset):
+        """Start a PendingAppend for rows that will be streamed into a dataset"""
+        return PendingAppend(self, dataset)
+
+    def register(self, name, datasets, builder):
+        """Add a view built by builder(registry) from the given datasets"""
+        with self._lock:
+            self.views[name] = (tuple(datasets), builder)
+            self._results.pop(name, None)
+
+    def materialize(self, names=None):
+        """Build every view (or only `names`) that is not current (used to preload a snapshot)"""
+        for name in (list(self.views) if names is None else names):
+            try:
+                self.get(name)
+            except Exception as e:
+                print(f"Error materializing view {name}: {e}")
+
+
+class PendingAppend:
+    """
+    Incremental view results folded over an append chunk by chunk while it
+    streams in, so the rows never need to be held together. commit() publishes
+    them once the store has the rows.
+    """
+
+    def __init__(self, registry, dataset):
+        self.registry = registry
+        self.dataset = dataset
+        self.previous_version = registry.store.dataset_version(dataset)
+        self._start = {}
+        self._pending = {}
+        for name in registry._incremental_views(dataset):
+            with registry._view_lock(name):
+                cached = registry._results.get(name)
+            if cached is not None and cached[0] == registry.version_key(name):
+                self._start[name] = cached
+                self._pending[name] = cached[1]
+
+    def add(self, rows):
+        for name, result in self._pending.items():
+            if result is not None:
+                self._pending[name] = self.registry.incremental[name](result, rows)
+
+    def commit(self):
+        registry = self.registry
+        for name, result in self._pending.items():
+            with registry._view_lock(name):
+                key, expected = registry._expected_key(name, self.dataset, self.previous_version)
+                if registry._results.get(name) is not self._start[name]:
+                    continue
+                if result is None:
+                    registry._results.pop(name, None)
+                elif self._start[name][0] == expected:
+                    registry._results[name] = (key, result)